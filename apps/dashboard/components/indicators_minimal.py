@@ -13,6 +13,7 @@ VEREINFACHTE VERSION - kompatibel mit NumPy 2.0
 """
 import pandas as pd
 import numpy as np
+import traceback
 
 class TechnicalIndicators:
     """Berechnet technische Indikatoren"""
@@ -190,7 +191,6 @@ class TechnicalIndicators:
             
         except Exception as e:
             print(f"⚠️  Fehler bei Indikator-Berechnung: {e}")
-            import traceback
             traceback.print_exc()
         
         return df
@@ -9,6 +9,7 @@ from ..hmi.ui import DashboardUI
 from ..hmi.backend import StockBackend
 import panel as pn
 import pandas as pd
+import traceback
 from datetime import datetime, timedelta
 import logging
 
@@ -803,7 +804,6 @@ class StockDashboardController:
         except Exception as e:
             self.ui.set_status(f"Fehler beim Laden der Daten: {str(e)}", "danger")
             logger.error(f"❌ Dashboard-Fehler: {e}")
-            import traceback
             traceback.print_exc()
         
         finally:
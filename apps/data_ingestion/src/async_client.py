@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+async_client.py - Asynchroner API Client für Bulk-Fetches (aiohttp + asyncio)
+"""
+
+import asyncio
+import collections
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiohttp
+from aiohttp import ClientTimeout
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+try:
+    from aiolimiter import AsyncLimiter
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AsyncLimiter = None
+    AIOLIMITER_AVAILABLE = False
+
+from apps.data_ingestion.src.massive_client import _INTERVAL_MAP, Bar, _fmt_date
+from config import settings
+
+logging.basicConfig(
+    level=settings.LOG_LEVEL,
+    format=settings.LOG_FORMAT
+)
+logger = logging.getLogger(__name__)
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    """
+    Entscheidet, ob ein Fehler einen Retry wert ist
+
+    Timeouts, Netzwerkfehler und 5xx sind transient; 4xx-Antworten
+    (z.B. 401 bei falschem API-Key) sind deterministisch und sollen
+    sofort hochgereicht werden statt 5 Backoff-Runden zu drehen.
+    """
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status >= 500
+    return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+class RateLimiter:
+    """
+    Asynchroner Token-Bucket über das Minuten-Kontingent der API
+
+    Proaktives Pacing statt reaktiver 429-Behandlung: alle Coroutinen
+    teilen sich ein Fenster von max_calls Requests pro per_seconds.
+    Ist das Fenster voll, schläft der nächste Aufrufer, bis der älteste
+    Eintrag herausfällt - es wird gar kein Roundtrip verschwendet.
+
+    Verwendung:
+        async with limiter:
+            await session.get(...)
+    """
+
+    def __init__(self, max_calls: int, per_seconds: float = 60.0):
+        self.max_calls = max_calls
+        self.per_seconds = per_seconds
+        self._calls: collections.deque = collections.deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wartet, bis ein Token frei ist, und verbraucht es"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.per_seconds:
+                    self._calls.popleft()
+
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+
+                wait_s = self.per_seconds - (now - self._calls[0])
+                logger.info(
+                    f"⏳ Rate-Limit ({self.max_calls}/{self.per_seconds:.0f}s) "
+                    f"- warte {wait_s:.1f}s"
+                )
+                await asyncio.sleep(wait_s)
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class AdaptiveSemaphore:
+    """
+    Semaphore mit AIMD-Regelung (TCP-artig) für die Parallelität
+
+    Statt einer festen Permit-Zahl wird das Limit wie bei TCP Congestion
+    Control nachgeführt: additiv erhöhen bei Erfolg (+alpha), multiplikativ
+    senken bei 429/5xx (*beta). Die Ingestion pendelt sich so am Knie der
+    Kurve ein, ohne dass die Parallelität von Hand getunt werden muss.
+
+    Verwendung:
+        async with sem:
+            ...
+        await sem.report_success()  # bzw. report_throttle()
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 64,
+        alpha: float = 0.5,
+        beta: float = 0.5
+    ):
+        self._limit = float(initial)
+        self._minimum = minimum
+        self._maximum = maximum
+        self._alpha = alpha
+        self._beta = beta
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Aktuelles Parallelitäts-Limit (gerundet)"""
+        return max(self._minimum, int(self._limit))
+
+    async def __aenter__(self) -> "AdaptiveSemaphore":
+        async with self._cond:
+            while self._active >= self.limit:
+                await self._cond.wait()
+            self._active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+        return False
+
+    async def report_success(self):
+        """Additive Erhöhung nach erfolgreicher Antwort"""
+        async with self._cond:
+            if self._limit < self._maximum:
+                self._limit = min(self._maximum, self._limit + self._alpha)
+                self._cond.notify_all()
+
+    async def report_throttle(self):
+        """Multiplikative Senkung nach 429/5xx"""
+        async with self._cond:
+            old = self.limit
+            self._limit = max(self._minimum, self._limit * self._beta)
+            if self.limit < old:
+                logger.info(
+                    f"📉 Parallelität gesenkt: {old} → {self.limit} (AIMD)"
+                )
+
+
+class AsyncMassiveClient:
+    """
+    Asynchroner Massive API Client für Bulk-Fetches über viele Ticker
+
+    Statt pro Ticker einen Thread (8MB Stack + GIL-Contention) zu belegen,
+    hält ein einzelner Event-Loop viele Requests gleichzeitig in-flight.
+    Ein asyncio.Semaphore begrenzt die Parallelität, damit weder der lokale
+    Socket-Pool noch das API-Rate-Limit überlaufen.
+
+    Verwendung:
+        async with AsyncMassiveClient() as client:
+            results = await client.get_multiple_tickers_data(symbols)
+    """
+
+    def __init__(self, max_concurrency: int = 20):
+        """
+        Initialisiert den asynchronen Massive API Client
+
+        Args:
+            max_concurrency: Maximale Anzahl gleichzeitiger Requests
+        """
+        self.api_key = settings.MASSIVE_API_KEY
+        self.base_url = settings.MASSIVE_BASE_URL
+        self.timeout = settings.API_TIMEOUT
+        self.max_concurrency = max_concurrency
+
+        if not self.api_key:
+            raise ValueError(
+                "MASSIVE_API_KEY nicht gefunden!\n"
+                "Bitte in .env Datei setzen: MASSIVE_API_KEY=your_key_here"
+            )
+
+        self._sem: Optional[AdaptiveSemaphore] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Token-Bucket über das Minuten-Kontingent (geteilt von allen Tasks).
+        # Bevorzugt aiolimiter (glattes Leaky-Bucket-Pacing); 90% des
+        # Limits als Puffer gegen Clock-Skew zwischen Client und API.
+        # Ohne aiolimiter greift der eigene Sliding-Window-Limiter.
+        if AIOLIMITER_AVAILABLE:
+            self._limiter = AsyncLimiter(
+                max_rate=max(1, int(settings.API_RPM_LIMIT * 0.9)),
+                time_period=60.0
+            )
+        else:
+            self._limiter = RateLimiter(settings.API_RPM_LIMIT, 60.0)
+
+        logger.info(
+            f"✅ AsyncMassiveClient initialisiert "
+            f"(Base: {self.base_url}, Concurrency: {max_concurrency})"
+        )
+
+    async def __aenter__(self) -> "AsyncMassiveClient":
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Erstellt die geteilte ClientSession (eine pro Client, gepoolt)"""
+        if self._session is None or self._session.closed:
+            # Eine Session für alle Requests: warme TCP/TLS-Verbindungen
+            # + DNS-Cache statt Handshake pro Request. Der Socket-Pool
+            # (64 pro Host) ist bewusst größer als die Request-Parallelität
+            # (Semaphore) - Verbindungen bleiben über keepalive warm
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=64,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            # AIMD: startet bei max_concurrency und regelt sich anhand
+            # der Antworten selbst nach (429/5xx senken, Erfolg erhöht)
+            self._sem = AdaptiveSemaphore(
+                initial=self.max_concurrency,
+                maximum=self.max_concurrency
+            )
+        return self._session
+
+    async def close(self):
+        """Schließt die ClientSession"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _make_request(
+        self,
+        url: str,
+        params: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Macht einen API-Request (begrenzt durch das Semaphore)
+
+        Args:
+            url: API-Endpunkt
+            params: Query-Parameter
+
+        Returns:
+            dict: API-Response oder None bei Fehler
+        """
+        if params is None:
+            params = {}
+
+        params['apiKey'] = self.api_key
+
+        session = await self._ensure_session()
+
+        async with self._sem:
+            try:
+                return await self._fetch(session, url, params)
+
+            except aiohttp.ClientResponseError as e:
+                logger.error(f"❌ HTTP Error {e.status}: {e.message}")
+                return None
+
+            except asyncio.TimeoutError:
+                logger.error(f"❌ API Timeout nach {self.timeout}s")
+                return None
+
+            except aiohttp.ClientError as e:
+                logger.error(f"❌ Netzwerkfehler: {e}")
+                return None
+
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(min=1, max=30),
+        retry=retry_if_exception(_is_transient_error),
+        reraise=True,
+    )
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        params: Dict
+    ) -> Optional[Dict]:
+        """
+        Einzelner Fetch mit Retry bei transienten Fehlern (tenacity)
+
+        Timeouts, Netzwerkfehler und 5xx (via raise_for_status) werden
+        bis zu 5-mal mit randomisiertem exponentiellem Backoff
+        wiederholt; erst danach schlägt der Request endgültig fehl.
+        Da das AIMD-Semaphore bei Throttle-Signalen die Parallelität
+        bereits gesenkt hat, treffen die Wiederholungen auf eine
+        entlastete API.
+        """
+        # Begrenzte Wiederholungen bei 429 mit Retry-After bzw.
+        # exponentiellem Backoff; Tokens kommen aus dem Limiter
+        for attempt in range(settings.API_MAX_RETRIES):
+            async with self._limiter:
+                async with session.get(
+                    url,
+                    params=params,
+                    timeout=ClientTimeout(total=self.timeout)
+                ) as response:
+                    if response.status == 429 or response.status >= 500:
+                        # Backpressure-Signal: Parallelität
+                        # multiplikativ senken (AIMD)
+                        await self._sem.report_throttle()
+
+                    if response.status == 429:
+                        retry_after = response.headers.get('Retry-After')
+                        if retry_after and retry_after.isdigit():
+                            sleep_s = min(
+                                float(retry_after),
+                                settings.API_RATE_LIMIT_DELAY
+                            )
+                        else:
+                            sleep_s = min(
+                                settings.API_RATE_LIMIT_DELAY,
+                                2 ** attempt
+                            )
+                        logger.warning(
+                            f"⚠️ Rate Limit erreicht - warte {sleep_s:.1f}s "
+                            f"(Versuch {attempt + 1}/{settings.API_MAX_RETRIES})"
+                        )
+                        await asyncio.sleep(sleep_s)
+                        continue
+
+                    if response.status == 404:
+                        logger.warning(f"⚠️ Ressource nicht gefunden: {url}")
+                        return None
+
+                    response.raise_for_status()
+
+                    # Erfolg: additiv wieder hochregeln, außer das
+                    # Restkontingent laut Provider ist fast leer
+                    remaining = response.headers.get('X-RateLimit-Remaining')
+                    if remaining and remaining.isdigit() and int(remaining) <= 1:
+                        await self._sem.report_throttle()
+                    else:
+                        await self._sem.report_success()
+
+                    return await response.json()
+
+        logger.error("❌ Rate Limit auch nach Backoff nicht abgeklungen")
+        return None
+
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        interval: str = settings.DEFAULT_INTERVAL,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Bar]:
+        """
+        Lädt historische OHLCV-Daten (asynchrone Variante von
+        MassiveClient.get_ohlcv)
+
+        Args:
+            symbol: Stock Symbol (z.B. 'AAPL')
+            interval: '1min', '5min', '15min', '30min', '1hour', '4hour', '1day', '1week', '1month'
+            start: Start-Datum
+            end: End-Datum
+
+        Returns:
+            List[Bar]: OHLCV-Daten
+        """
+        if interval not in _INTERVAL_MAP:
+            logger.warning(f"⚠️ Unbekanntes Intervall {interval}, verwende 1day")
+            interval = '1day'
+
+        multiplier, timespan = _INTERVAL_MAP[interval]
+
+        now = datetime.now()
+        if not start:
+            start = now.replace(day=1)
+        if not end:
+            end = now
+
+        from_date = _fmt_date(start.date())
+        to_date = _fmt_date(end.date())
+
+        url = f"{self.base_url}/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{from_date}/{to_date}"
+
+        params = {
+            'adjusted': 'true',
+            'sort': 'asc',
+            'limit': settings.MAX_DATA_POINTS
+        }
+
+        logger.info(f"📊 API Request: {symbol} ({interval}) {from_date} → {to_date}")
+
+        data = await self._make_request(url, params)
+
+        if not data:
+            return []
+
+        results = data.get('results', [])
+
+        if not results:
+            logger.warning(f"⚠️ Keine Daten für {symbol} im Zeitraum {from_date} - {to_date}")
+            return []
+
+        ohlcv_data = [Bar.from_agg(bar) for bar in results]
+
+        logger.info(f"✅ {len(ohlcv_data)} Datenpunkte geladen")
+        return ohlcv_data
+
+    async def get_historical_data(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = settings.DEFAULT_INTERVAL
+    ) -> List[Bar]:
+        """Alias für get_ohlcv() (für Kompatibilität)"""
+        return await self.get_ohlcv(ticker, interval, start_date, end_date)
+
+    async def iter_all_tickers(
+        self,
+        asset_class: str = 'stocks',
+        active: bool = True
+    ) -> AsyncIterator[Dict]:
+        """
+        Streamt alle verfügbaren Ticker seitenweise über den next_url-Cursor
+
+        Yieldet Ticker, sobald die erste Seite da ist, statt alle Seiten
+        im RAM zu puffern: Peak-Memory bleibt O(page_size) und der erste
+        Ticker ist nach einem Roundtrip verfügbar, während die nächste
+        Seite bereits geladen wird.
+
+        Args:
+            asset_class: 'stocks', 'crypto', 'forex', 'indices'
+            active: Nur aktive Ticker
+
+        Yields:
+            dict: Einzelne Ticker-Einträge
+        """
+        url = f"{self.base_url}/v3/reference/tickers"
+
+        params: Optional[Dict] = {
+            'type': 'CS',
+            'market': asset_class,
+            'active': 'true' if active else 'false',
+            'order': 'asc',
+            'limit': 1000,
+            'sort': 'ticker'
+        }
+
+        logger.info(f"📥 Streame alle {asset_class} Ticker...")
+
+        page = 0
+        while url:
+            data = await self._make_request(url, params)
+
+            if not data:
+                return
+
+            page += 1
+            results = data.get('results', [])
+            logger.info(f"📄 Ticker-Seite {page} mit {len(results)} Einträgen")
+
+            for ticker in results:
+                yield ticker
+
+            # next_url trägt alle Query-Parameter bereits im Cursor,
+            # _make_request hängt nur den apiKey erneut an
+            url = data.get('next_url')
+            params = None
+
+    async def get_multiple_tickers_data(
+        self,
+        symbols: List[str],
+        interval: str = settings.DEFAULT_INTERVAL,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, List[Bar]]:
+        """
+        Lädt OHLCV-Daten für viele Symbole parallel
+
+        Alle Requests teilen sich eine Session und das Semaphore, sodass
+        maximal max_concurrency Requests gleichzeitig laufen.
+
+        Args:
+            symbols: Liste von Ticker-Symbolen
+            interval: Zeitintervall
+            start: Start-Datum
+            end: End-Datum
+
+        Returns:
+            Dict[str, List[Bar]]: Symbol -> OHLCV-Daten
+        """
+        logger.info(f"🚀 Starte Bulk-Fetch für {len(symbols)} Symbole...")
+
+        await self._ensure_session()
+
+        results = await asyncio.gather(
+            *[self.get_ohlcv(symbol, interval, start, end) for symbol in symbols],
+            return_exceptions=True
+        )
+
+        data = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Fehler bei {symbol}: {result}")
+                data[symbol] = []
+            else:
+                data[symbol] = result
+
+        loaded = sum(1 for v in data.values() if v)
+        logger.info(f"✅ Bulk-Fetch abgeschlossen: {loaded}/{len(symbols)} Symbole mit Daten")
+        return data
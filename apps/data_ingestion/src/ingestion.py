@@ -8,16 +8,62 @@ Created on Wed Jan 14 22:02:25 2026
 
 #from database import get_db_session, engine
 #from massive_client import MassiveClient
-from apps.data_ingestion.src.database import get_db_session, engine
+from apps.data_ingestion.src.async_client import AsyncMassiveClient
+from apps.data_ingestion.src.database import bulk_copy, copy_csv, get_db_session, engine
 from apps.data_ingestion.src.massive_client import MassiveClient
 from sqlalchemy import text
-from datetime import datetime
+from datetime import datetime, timezone
+from types import MappingProxyType
+import csv
+import io
+import logging
 import pandas as pd
-from typing import List, Dict
-from dotenv import load_dotenv
-import os
+from typing import Final, List, Dict, Mapping
+
+from config import settings
+
+logging.basicConfig(
+    level=settings.LOG_LEVEL,
+    format=settings.LOG_FORMAT
+)
+logger = logging.getLogger(__name__)
+
+# Spalten-Mapping (Massive-Response -> DB-Schema) einmal pro Prozess
+# statt pro _transform_massive_response-Aufruf
+_COLUMN_MAP: Final[Mapping[str, str]] = MappingProxyType({
+    't': 'time',
+    'o': 'open',
+    'h': 'high',
+    'l': 'low',
+    'c': 'close',
+    'v': 'volume',
+    'vw': 'vwap',  # Volume Weighted Average Price
+    'n': 'transactions'
+})
+
+# Unnest-Upsert einmal pro Prozess bauen - wird vom DataFrame- und vom
+# Bar-Fallback geteilt (ein Array-Parameter pro Spalte, statisches SQL)
+_OHLCV_UNNEST_UPSERT = text("""
+    INSERT INTO stock_ohlcv (time, symbol, open, high, low, close, volume, interval)
+    SELECT * FROM unnest(
+        CAST(:times AS timestamptz[]),
+        CAST(:symbols AS varchar[]),
+        CAST(:opens AS numeric[]),
+        CAST(:highs AS numeric[]),
+        CAST(:lows AS numeric[]),
+        CAST(:closes AS numeric[]),
+        CAST(:volumes AS bigint[]),
+        CAST(:intervals AS varchar[])
+    )
+    ON CONFLICT (symbol, time, interval)
+    DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume
+""")
 
-load_dotenv()
 
 class StockDataIngestion:
     """Service zum Laden und Speichern von Stock-Daten über Massive.com API"""
@@ -45,20 +91,9 @@ class StockDataIngestion:
             return pd.DataFrame()
         
         df = pd.DataFrame(raw_data)
-        
+
         # Spalten umbenennen
-        column_mapping = {
-            't': 'time',
-            'o': 'open',
-            'h': 'high',
-            'l': 'low',
-            'c': 'close',
-            'v': 'volume',
-            'vw': 'vwap',  # Volume Weighted Average Price
-            'n': 'transactions'
-        }
-        
-        df.rename(columns=column_mapping, inplace=True)
+        df.rename(columns=dict(_COLUMN_MAP), inplace=True)
         
         # Timestamp von Millisekunden zu datetime konvertieren
         df['time'] = pd.to_datetime(df['time'], unit='ms')
@@ -82,7 +117,7 @@ class StockDataIngestion:
             interval: Zeitintervall (z.B. '1min', '5min', '1day')
         """
         if df.empty:
-            print("⚠️  Keine Daten zum Speichern")
+            logger.warning("⚠️ Keine Daten zum Speichern")
             return
         
         # Interval-Spalte hinzufügen
@@ -90,51 +125,205 @@ class StockDataIngestion:
         
         # Datenbank-kompatible Spaltennamen sicherstellen
         df = df[['time', 'symbol', 'open', 'high', 'low', 'close', 'volume', 'interval']]
-        
+
+        # volume kommt bei adjusted=true oft als float64 an - die
+        # BIGINT-Spalte lehnt '70790813.0' im COPY-CSV ab, daher vor
+        # dem Streamen nach int64 casten
+        df['volume'] = df['volume'].astype('int64')
+
         try:
-            # Bulk insert mit pandas + ON CONFLICT handling
-            with engine.begin() as connection:
-                # Temporäre Tabelle erstellen
-                df.to_sql(
-                    'temp_ohlcv',
-                    connection,
-                    if_exists='replace',
-                    index=False,
-                    method='multi'
+            try:
+                # Bulk insert per COPY + ON CONFLICT handling: COPY streamt
+                # alle Zeilen in einem Stück (kein Parse/Plan pro Zeile)
+                with engine.begin() as connection:
+                    # Temporäre Tabelle mit dem Schema der Zieltabelle
+                    connection.execute(text("""
+                        CREATE TEMP TABLE temp_ohlcv
+                        (LIKE stock_ohlcv INCLUDING DEFAULTS)
+                        ON COMMIT DROP
+                    """))
+                    bulk_copy(df, 'temp_ohlcv', connection)
+
+                    # UPSERT: INSERT mit ON CONFLICT DO UPDATE
+                    upsert_query = text("""
+                        INSERT INTO stock_ohlcv (time, symbol, open, high, low, close, volume, interval)
+                        SELECT time, symbol, open, high, low, close, volume, interval
+                        FROM temp_ohlcv
+                        ON CONFLICT (symbol, time, interval)
+                        DO UPDATE SET
+                            open = EXCLUDED.open,
+                            high = EXCLUDED.high,
+                            low = EXCLUDED.low,
+                            close = EXCLUDED.close,
+                            volume = EXCLUDED.volume
+                    """)
+
+                    connection.execute(upsert_query)
+
+            except Exception as copy_error:
+                # COPY kann an fehlenden Rechten scheitern - unnest-Arrays
+                # sind der nächstbeste Bulk-Pfad (ein Parameter pro Spalte)
+                logger.warning(
+                    f"⚠️ COPY fehlgeschlagen ({copy_error}) - "
+                    f"falle auf unnest-Bulk-Insert zurück"
                 )
-                
-                # UPSERT: INSERT mit ON CONFLICT DO UPDATE
-                upsert_query = text("""
-                    INSERT INTO stock_ohlcv (time, symbol, open, high, low, close, volume, interval)
-                    SELECT time, symbol, open, high, low, close, volume, interval
-                    FROM temp_ohlcv
-                    ON CONFLICT (symbol, time, interval) 
-                    DO UPDATE SET
-                        open = EXCLUDED.open,
-                        high = EXCLUDED.high,
-                        low = EXCLUDED.low,
-                        close = EXCLUDED.close,
-                        volume = EXCLUDED.volume
-                """)
-                
-                connection.execute(upsert_query)
-                
-                # Temp-Tabelle droppen
-                connection.execute(text("DROP TABLE IF EXISTS temp_ohlcv"))
-            
-            print(f"✅ {len(df)} OHLCV-Datensätze für {df['symbol'].iloc[0]} gespeichert")
-            
+                with engine.begin() as connection:
+                    self._bulk_insert_ohlcv_unnest(connection, df)
+
+            symbol = df['symbol'].iloc[0]
+            logger.info(f"✅ {len(df)} OHLCV-Datensätze für {symbol} gespeichert")
+
+            # Frisch geschriebene Bars dürfen nicht von alten
+            # 24h-TTL-Cache-Einträgen überdeckt werden
+            self.client.invalidate(symbol)
+
         except Exception as e:
-            print(f"❌ Fehler beim Speichern: {e}")
+            logger.error(f"❌ Fehler beim Speichern: {e}")
             raise
-    
+
+    def _bulk_insert_ohlcv_unnest(self, connection, df: pd.DataFrame):
+        """
+        Bulk-Upsert über unnest-Arrays (Fallback, wenn COPY nicht geht)
+
+        Ein Array-Parameter pro Spalte statt ein Bind-Parameter pro Zelle:
+        die Payload wächst mit Spalten+Zeilen statt Spalten*Zeilen und das
+        Statement bleibt statisch (ein Parse, kein 65535-Parameter-Limit).
+
+        Args:
+            connection: SQLAlchemy-Connection (innerhalb einer Transaktion)
+            df: DataFrame mit Spalten [time, symbol, open, high, low, close, volume, interval]
+        """
+        # Spaltenweise Listen (column-major) statt Zeilen-Tupel
+        connection.execute(_OHLCV_UNNEST_UPSERT, {
+            'times': [t.isoformat() for t in df['time']],
+            'symbols': df['symbol'].tolist(),
+            'opens': df['open'].tolist(),
+            'highs': df['high'].tolist(),
+            'lows': df['low'].tolist(),
+            'closes': df['close'].tolist(),
+            'volumes': df['volume'].tolist(),
+            'intervals': df['interval'].tolist()
+        })
+
+    def _bulk_insert_ohlcv_unnest_bars(
+        self, connection, bars: List, symbol: str, interval: str
+    ):
+        """
+        Unnest-Fallback für den Bar-Pfad (ohne pandas)
+
+        Gleiches Statement wie _bulk_insert_ohlcv_unnest, die
+        Spaltenlisten werden direkt aus den Bar-Objekten gebaut.
+
+        Args:
+            connection: SQLAlchemy-Connection (innerhalb einer Transaktion)
+            bars: Liste von Bar-Objekten (time in ms)
+            symbol: Ticker-Symbol
+            interval: Zeitintervall
+        """
+        n = len(bars)
+        connection.execute(_OHLCV_UNNEST_UPSERT, {
+            'times': [
+                datetime.fromtimestamp(b.time / 1000, tz=timezone.utc).isoformat()
+                for b in bars
+            ],
+            'symbols': [symbol] * n,
+            'opens': [b.open for b in bars],
+            'highs': [b.high for b in bars],
+            'lows': [b.low for b in bars],
+            'closes': [b.close for b in bars],
+            'volumes': [int(b.volume) for b in bars],
+            'intervals': [interval] * n
+        })
+
+    def save_ohlcv_bars(self, bars: List, symbol: str, interval: str = '1day'):
+        """
+        Speichert OHLCV-Bars ohne pandas-Umweg (Tupel direkt in COPY)
+
+        Für den Staging-zu-COPY-Pfad ist der DataFrame reiner Overhead:
+        die Bars werden als CSV-Zeilen direkt aus den geparsten Objekten
+        serialisiert - kein Block-Manager, kein Objekt-Boxing pro Spalte.
+
+        Args:
+            bars: Liste von Bar-Objekten (time in ms, open/high/low/close/volume)
+            symbol: Ticker-Symbol
+            interval: Zeitintervall (z.B. '1min', '5min', '1day')
+        """
+        if not bars:
+            logger.warning("⚠️ Keine Daten zum Speichern")
+            return
+
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for bar in bars:
+            writer.writerow((
+                datetime.fromtimestamp(bar.time / 1000, tz=timezone.utc).isoformat(),
+                symbol,
+                bar.open,
+                bar.high,
+                bar.low,
+                bar.close,
+                int(bar.volume),
+                interval
+            ))
+        buf.seek(0)
+
+        try:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(text("""
+                        CREATE TEMP TABLE temp_ohlcv
+                        (LIKE stock_ohlcv INCLUDING DEFAULTS)
+                        ON COMMIT DROP
+                    """))
+
+                    copy_csv(
+                        buf, 'temp_ohlcv',
+                        'time, symbol, open, high, low, close, volume, interval',
+                        connection
+                    )
+
+                    connection.execute(text("""
+                        INSERT INTO stock_ohlcv (time, symbol, open, high, low, close, volume, interval)
+                        SELECT time, symbol, open, high, low, close, volume, interval
+                        FROM temp_ohlcv
+                        ON CONFLICT (symbol, time, interval)
+                        DO UPDATE SET
+                            open = EXCLUDED.open,
+                            high = EXCLUDED.high,
+                            low = EXCLUDED.low,
+                            close = EXCLUDED.close,
+                            volume = EXCLUDED.volume
+                    """))
+
+            except Exception as copy_error:
+                # COPY kann an fehlenden Rechten scheitern - unnest-Arrays
+                # sind der nächstbeste Bulk-Pfad (wie in save_ohlcv_data)
+                logger.warning(
+                    f"⚠️ COPY fehlgeschlagen ({copy_error}) - "
+                    f"falle auf unnest-Bulk-Insert zurück"
+                )
+                with engine.begin() as connection:
+                    self._bulk_insert_ohlcv_unnest_bars(
+                        connection, bars, symbol, interval
+                    )
+
+            logger.info(f"✅ {len(bars)} OHLCV-Datensätze für {symbol} gespeichert")
+
+            # Frisch geschriebene Bars dürfen nicht von alten
+            # 24h-TTL-Cache-Einträgen überdeckt werden
+            self.client.invalidate(symbol)
+
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Speichern: {e}")
+            raise
+
     def save_quotes_data(self, df: pd.DataFrame):
         """
         Speichert Tick-Daten in der stock_quotes Tabelle
         Hinweis: Für minutengenaue und höhere Auflösungen
         """
         if df.empty:
-            print("⚠️  Keine Quote-Daten zum Speichern")
+            logger.warning("⚠️ Keine Quote-Daten zum Speichern")
             return
         
         # Für stock_quotes brauchen wir: time, symbol, price, volume, bid, ask
@@ -175,10 +364,10 @@ class StockDataIngestion:
                 connection.execute(upsert_query)
                 connection.execute(text("DROP TABLE IF EXISTS temp_quotes"))
             
-            print(f"✅ {len(df_quotes)} Quote-Datensätze gespeichert")
+            logger.info(f"✅ {len(df_quotes)} Quote-Datensätze gespeichert")
             
         except Exception as e:
-            print(f"❌ Fehler beim Speichern der Quotes: {e}")
+            logger.error(f"❌ Fehler beim Speichern der Quotes: {e}")
             raise
     
     def ingest_symbol(
@@ -199,11 +388,10 @@ class StockDataIngestion:
             interval: Zeitintervall ('1min', '5min', '1hour', '1day', etc.)
             save_as_quotes: Wenn True, zusätzlich in stock_quotes speichern
         """
-        print(f"\n{'='*60}")
-        print(f"📥 Lade Daten für {symbol}")
-        print(f"   Zeitraum: {start_date.date()} bis {end_date.date()}")
-        print(f"   Interval: {interval}")
-        print(f"{'='*60}")
+        logger.info(
+            f"📥 Lade Daten für {symbol} "
+            f"({start_date.date()} bis {end_date.date()}, {interval})"
+        )
         
         # Daten von Massive.com laden
         raw_data = self.client.get_historical_data(
@@ -214,29 +402,32 @@ class StockDataIngestion:
         )
         
         if not raw_data:
-            print(f"⚠️  Keine Daten für {symbol} gefunden")
+            logger.warning(f"⚠️ Keine Daten für {symbol} gefunden")
             return
-        
-        # In DataFrame transformieren
-        df = self._transform_massive_response(raw_data, symbol)
-        
-        if df.empty:
-            print(f"⚠️  Transformation ergab leeren DataFrame")
-            return
-        
-        # Statistiken anzeigen
-        print(f"\n📊 Daten-Statistiken:")
-        print(f"   Anzahl Datensätze: {len(df)}")
-        print(f"   Zeitraum: {df['time'].min()} bis {df['time'].max()}")
-        print(f"   Close-Preis: {df['close'].min():.2f} - {df['close'].max():.2f}")
-        print(f"   Durchschn. Volumen: {df['volume'].mean():.0f}")
-        
-        # In Datenbank speichern
-        self.save_ohlcv_data(df, interval=interval)
-        
-        # Optional: Auch als Quotes speichern (für minutengenaue Daten)
+
         if save_as_quotes and interval in ['1min', '5min', '15min']:
+            # Quotes-Pfad braucht den DataFrame (Spalten-Mapping auf
+            # stock_quotes), daher hier weiter über pandas
+            df = self._transform_massive_response(raw_data, symbol)
+
+            if df.empty:
+                logger.warning("⚠️ Transformation ergab leeren DataFrame")
+                return
+
+            logger.info(
+                f"📊 {symbol}: {len(df)} Datensätze, "
+                f"{df['time'].min()} bis {df['time'].max()}, "
+                f"Close {df['close'].min():.2f}-{df['close'].max():.2f}, "
+                f"Ø Volumen {df['volume'].mean():.0f}"
+            )
+
+            self.save_ohlcv_data(df, interval=interval)
             self.save_quotes_data(df)
+        else:
+            # Heißer Standard-Pfad ohne pandas: Bars gehen als Tupel
+            # direkt in COPY (kein Block-Manager, kein Boxing)
+            logger.info(f"📊 {symbol}: {len(raw_data)} Datensätze")
+            self.save_ohlcv_bars(raw_data, symbol, interval=interval)
     
     def ingest_multiple_symbols(
         self,
@@ -246,10 +437,10 @@ class StockDataIngestion:
         interval: str = '1day'
     ):
         """Lädt Daten für mehrere Symbole"""
-        print(f"\n🔄 Lade Daten für {len(symbols)} Symbole...")
+        logger.info(f"🔄 Lade Daten für {len(symbols)} Symbole...")
         
         for i, symbol in enumerate(symbols, 1):
-            print(f"\n[{i}/{len(symbols)}]")
+            logger.info(f"[{i}/{len(symbols)}] {symbol}")
             try:
                 self.ingest_symbol(
                     symbol=symbol,
@@ -258,7 +449,57 @@ class StockDataIngestion:
                     interval=interval
                 )
             except Exception as e:
-                print(f"❌ Fehler bei {symbol}: {e}")
+                logger.error(f"❌ Fehler bei {symbol}: {e}")
                 continue
-        
-        print(f"\n✅ Batch-Ingestion abgeschlossen!")
+
+        logger.info("✅ Batch-Ingestion abgeschlossen!")
+
+    async def ingest_multiple_symbols_async(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = '1day',
+        max_concurrency: int = 10
+    ):
+        """
+        Lädt Daten für mehrere Symbole parallel (asyncio + aiohttp)
+
+        Der Engpass ist HTTP-I/O zur API, nicht CPU: alle Symbole werden
+        über eine geteilte aiohttp-Session gleichzeitig angefragt
+        (asyncio.gather), statt sie nacheinander abzuarbeiten. Die
+        Wartezeiten überlappen sich, die Wallclock-Zeit sinkt annähernd
+        linear mit der Parallelität. Gespeichert wird anschließend
+        synchron - die DB ist lokal und nicht der Engpass.
+
+        Zwei getrennte Limits: der Rate-Limiter im Client drosselt auf
+        das API-Kontingent (RPM), das Semaphore begrenzt zusätzlich die
+        lokalen Ressourcen (offene Sockets/FDs) - wichtig, sobald das
+        Symbol-Universum deutlich größer wird als die Testliste.
+
+        Args:
+            symbols: Liste von Ticker-Symbolen
+            start_date: Start-Datum
+            end_date: End-Datum
+            interval: Zeitintervall (z.B. '1day')
+            max_concurrency: Obergrenze gleichzeitiger Requests (lokales
+                Ressourcen-Limit, unabhängig vom API-Rate-Limit)
+        """
+        logger.info(f"🚀 Starte parallele Ingestion für {len(symbols)} Symbole...")
+
+        async with AsyncMassiveClient(max_concurrency=max_concurrency) as client:
+            data = await client.get_multiple_tickers_data(
+                symbols, interval, start_date, end_date
+            )
+
+        for symbol, bars in data.items():
+            if not bars:
+                logger.warning(f"⚠️ Keine Daten für {symbol} gefunden")
+                continue
+
+            # Gleicher pandas-freier Pfad wie ingest_symbol: Bars gehen
+            # als Tupel direkt in COPY
+            logger.info(f"📊 {symbol}: {len(bars)} Datensätze")
+            self.save_ohlcv_bars(bars, symbol, interval=interval)
+
+        logger.info("✅ Parallele Batch-Ingestion abgeschlossen!")
@@ -12,19 +12,44 @@ Created on Thu Jan 22 21:32:20 2026
 massive_client.py - Optimierter API Client mit Retry-Logik
 """
 
+import asyncio
+import collections
 import os
+import random
+import threading
+import time
+import orjson
+import pandas as pd
 import requests
-from datetime import datetime
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from types import MappingProxyType
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
     retry_if_exception_type
 )
-from requests.exceptions import HTTPError, Timeout, RequestException
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, Timeout, RequestException, RetryError
+from urllib3.util.retry import Retry
 import logging
-from typing import List, Dict, Optional
+from typing import Final, Iterator, List, Dict, Mapping, Optional
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
 
 from config import settings
 
@@ -34,19 +59,211 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Fehlerklassen beider Transporte (requests und optional httpx),
+# damit _make_request transportunabhängig bleibt
+if HTTPX_AVAILABLE:
+    _HTTP_STATUS_ERRORS = (HTTPError, httpx.HTTPStatusError)
+    _TIMEOUT_ERRORS = (Timeout, httpx.TimeoutException)
+    _NETWORK_ERRORS = (RequestException, httpx.HTTPError)
+    # httpx.TransportError deckt Timeouts UND Verbindungsfehler ab -
+    # beide Transporte bekommen damit dieselbe Retry-Abdeckung
+    _RETRYABLE_ERRORS = (Timeout, ConnectionError, httpx.TransportError)
+else:
+    _HTTP_STATUS_ERRORS = (HTTPError,)
+    _TIMEOUT_ERRORS = (Timeout,)
+    _NETWORK_ERRORS = (RequestException,)
+    _RETRYABLE_ERRORS = (Timeout, ConnectionError)
+
+# Intervall-Mapping einmal pro Prozess statt pro get_ohlcv-Aufruf
+# (MappingProxyType = eingefrorene Sicht, kann nicht versehentlich mutieren)
+_INTERVAL_MAP: Final[Mapping[str, tuple]] = MappingProxyType({
+    '1min': ('1', 'minute'),
+    '5min': ('5', 'minute'),
+    '15min': ('15', 'minute'),
+    '30min': ('30', 'minute'),
+    '1hour': ('1', 'hour'),
+    '4hour': ('4', 'hour'),
+    '1day': ('1', 'day'),
+    '1week': ('1', 'week'),
+    '1month': ('1', 'month')
+})
+
+
+@dataclass(slots=True)
+class Bar:
+    """
+    Ein OHLCV-Balken als schlankes Record-Objekt
+
+    Mit __slots__ ca. 5x kleiner als ein Dict mit 6 Keys - bei 50k Bars
+    pro Response deutlich weniger Allokationen und Cache-Misses.
+    pd.DataFrame(list_of_bars) funktioniert direkt (pandas versteht
+    Dataclasses), für Legacy-Code gibt es to_dict().
+    """
+    time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    @classmethod
+    def from_agg(cls, bar: Dict) -> "Bar":
+        """Baut einen Bar aus einem Polygon-Aggregate-Eintrag (t/o/h/l/c/v)"""
+        return cls(
+            time=bar.get('t'),
+            open=bar.get('o'),
+            high=bar.get('h'),
+            low=bar.get('l'),
+            close=bar.get('c'),
+            volume=bar.get('v')
+        )
+
+    def to_dict(self) -> Dict:
+        """Kompatibilitäts-Shim für Code, der Dict-Zugriff erwartet"""
+        return {
+            'time': self.time,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume
+        }
+
+
+# Prozessweites RPM-Fenster: alle MassiveClient-Instanzen teilen sich
+# EIN API-Kontingent, auch über Threads hinweg (z.B. run_all_tests im
+# Test-Harness) - sonst vervielfacht jeder Client/Thread das Budget
+_RPM_LOCK = threading.Lock()
+_REQUEST_LOG: collections.deque = collections.deque()
+
+
+@lru_cache(maxsize=128)
+def _fmt_date(day: date) -> str:
+    """
+    Formatiert ein Datum als 'YYYY-MM-DD' (gecacht)
+
+    isoformat() umgeht den Locale-Pfad von strftime und der lru_cache
+    dedupliziert identische Datumsgrenzen in Bulk-Loops über viele Ticker.
+    """
+    return day.isoformat()
+
 
 class MassiveClient:
     """
     Optimierter API Client mit Retry-Logik und besserem Error Handling
     """
-    
-    def __init__(self):
-        """Initialisiert den Massive API Client"""
-        load_dotenv()
-        
+
+    # Lebensdauer des Snapshot-Caches für get_ticker_details (Sekunden)
+    SNAPSHOT_TTL = 300
+
+    def __init__(self, transport: str = 'httpx'):
+        """
+        Initialisiert den Massive API Client
+
+        Args:
+            transport: 'httpx' (HTTP/2, Default) oder 'requests' (HTTP/1.1).
+                Mit httpx werden viele parallele Requests über eine
+                einzige TLS-Verbindung gemultiplext; ohne installiertes
+                httpx fällt der Client auf requests zurück.
+        """
         self.api_key = settings.MASSIVE_API_KEY
         self.base_url = settings.MASSIVE_BASE_URL
         self.timeout = settings.API_TIMEOUT
+
+        # Optionaler HTTP/2-Transport über httpx
+        self._client = None
+        if transport == 'httpx':
+            if HTTPX_AVAILABLE:
+                self._client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=20,
+                        max_keepalive_connections=20
+                    ),
+                    timeout=self.timeout,
+                    params={'apiKey': self.api_key}
+                )
+            else:
+                logger.warning(
+                    "⚠️ httpx nicht installiert - falle auf requests (HTTP/1.1) zurück"
+                )
+                transport = 'requests'
+        self.transport = transport
+
+        # Gepoolte Session statt requests.get pro Aufruf: TCP/TLS-Verbindung
+        # bleibt warm, kein Handshake + DNS-Lookup pro Request
+        self._session = requests.Session()
+        self._session.params = {'apiKey': self.api_key}
+        # Kompression explizit anfordern; urllib3 dekomprimiert beim
+        # Lesen, orjson parst dann direkt die Bytes ohne str-Umweg
+        self._session.headers.update({
+            'Accept-Encoding': 'gzip',
+            'User-Agent': 'stock-data-stream/1.0'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            # Retry auf Adapter-Ebene: transienter 429/5xx kostet keinen
+            # neuen TCP/TLS-Aufbau und Retry-After wird direkt befolgt
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+                allowed_methods=frozenset(['GET'])
+            )
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        # Optionaler Redis-Cache: wiederholte Abfragen (Dashboard-Refresh,
+        # Test-Scripts) kommen aus dem Cache statt über das Netz
+        self._redis = None
+        if REDIS_AVAILABLE:
+            try:
+                self._redis = redis.Redis(
+                    host=settings.REDIS_HOST,
+                    port=settings.REDIS_PORT
+                )
+                self._redis.ping()
+                logger.info(f"✅ Redis-Cache verbunden ({settings.REDIS_HOST})")
+            except Exception:
+                logger.warning("⚠️ Redis nicht erreichbar - Cache deaktiviert")
+                self._redis = None
+
+        # Optionaler Parquet-Mirror: jede frische OHLCV-Antwort landet
+        # zusätzlich in einem lokalen spaltenorientierten Dataset -
+        # dient als Offline-Fallback, wenn die API nicht erreichbar ist
+        self._parquet_cache = None
+        try:
+            # Lokaler Import, da ohlcv_cache Bar aus diesem Modul importiert
+            from apps.data_ingestion.src.ohlcv_cache import OhlcvParquetCache
+            self._parquet_cache = OhlcvParquetCache()
+        except ImportError:
+            logger.warning("⚠️ pyarrow nicht installiert - Parquet-Cache deaktiviert")
+        except Exception as e:
+            logger.warning(f"⚠️ Parquet-Cache deaktiviert ({e})")
+
+        # Snapshot-Cache: ein Bulk-Request statt N Einzel-Lookups
+        self._snapshot_cache: Dict[str, Dict] = {}
+        self._snapshot_cache_time: float = 0.0
+
+        # Ticker-Details pro Instanz memoisieren: Metadaten ändern sich
+        # höchstens täglich, Fehlschläge (leeres Dict) werden bewusst
+        # nicht gecacht und beim nächsten Aufruf erneut versucht
+        self._ticker_details_cache: Dict[str, Dict] = {}
+
+        # Sliding-Window RPM-Zähler: Requests proaktiv drosseln,
+        # statt das Rate Limit erst über 429-Fehler zu entdecken
+        # (das Fenster selbst ist prozessweit, siehe _REQUEST_LOG)
+        self._rpm_limit = settings.API_RPM_LIMIT
+
+        # URL-Bausteine einmal bauen statt f-String-Arbeit pro Aufruf;
+        # der Aggregate-Endpunkt ist der heißeste Pfad und nutzt
+        # ''.join über fertige Teilstrings (kein FORMAT_VALUE-Bytecode)
+        self._ohlcv_prefix = f"{self.base_url}/v2/aggs/ticker/"
+        self._range_sep = "/range/"
+        self._ticker_details_tpl = f"{self.base_url}/v3/reference/tickers/{{ticker}}"
         
         if not self.api_key:
             raise ValueError(
@@ -81,6 +298,105 @@ class MassiveClient:
             logger.error(f"❌ Verbindungsfehler: {e}")
             return False
     
+    def _ohlcv_url(
+        self,
+        symbol: str,
+        multiplier: str,
+        timespan: str,
+        from_date: str,
+        to_date: str
+    ) -> str:
+        """Baut die Aggregate-URL aus vorberechneten Teilstrings"""
+        return ''.join((
+            self._ohlcv_prefix, symbol,
+            self._range_sep, str(multiplier),
+            '/', timespan,
+            '/', from_date,
+            '/', to_date
+        ))
+
+    def _http_get(self, url: str, params: Optional[Dict]):
+        """Führt einen GET über den gewählten Transport aus"""
+        if self._client is not None:
+            # httpx.Client trägt Timeout + Limits bereits in sich
+            return self._client.get(url, params=params)
+        return self._session.get(url, params=params, timeout=self.timeout)
+
+    def close(self):
+        """Schließt gehaltene HTTP-Verbindungen"""
+        self._session.close()
+        if self._client is not None:
+            self._client.close()
+
+    def __enter__(self) -> "MassiveClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        """Liest einen Cache-Eintrag (Redis-Ausfall ist kein Fehler)"""
+        if self._redis is None:
+            return None
+        try:
+            cached = self._redis.get(key)
+            if cached:
+                logger.info(f"📦 Cache-Hit: {key}")
+            return cached
+        except Exception as e:
+            logger.warning(f"⚠️ Redis-Fehler beim Lesen ({e}) - nutze API")
+            return None
+
+    def _cache_set(self, key: str, payload: bytes) -> None:
+        """Schreibt einen Cache-Eintrag mit TTL (best effort)"""
+        if self._redis is None:
+            return
+        try:
+            self._redis.setex(key, settings.REDIS_CACHE_TTL, payload)
+        except Exception as e:
+            logger.warning(f"⚠️ Redis-Fehler beim Schreiben ({e})")
+
+    def invalidate(self, symbol: str) -> None:
+        """
+        Entfernt alle gecachten OHLCV-Einträge eines Symbols
+        (z.B. nach einer frischen Ingestion)
+        """
+        if self._redis is None:
+            return
+        try:
+            keys = list(self._redis.scan_iter(f"ohlcv:{symbol}:*"))
+            if keys:
+                self._redis.delete(*keys)
+                logger.info(f"🗑️ {len(keys)} Cache-Einträge für {symbol} entfernt")
+        except Exception as e:
+            logger.warning(f"⚠️ Redis-Fehler beim Invalidieren ({e})")
+
+    def _wait_if_throttled(self):
+        """
+        Reserviert einen Slot im prozessweiten RPM-Fenster (ggf. warten)
+
+        Das Sliding-Window der letzten Request-Zeiten ist prozessweit
+        und lock-geschützt: Check und Reservierung passieren atomar,
+        damit parallele Threads und mehrere Client-Instanzen sich EIN
+        Kontingent teilen statt es zu vervielfachen. Ist das Fenster
+        voll, schläft der Aufrufer außerhalb des Locks, bis der älteste
+        Eintrag herausfällt - so entsteht gar kein 429-Burst.
+        """
+        while True:
+            with _RPM_LOCK:
+                now = time.time()
+                while _REQUEST_LOG and now - _REQUEST_LOG[0] >= 60:
+                    _REQUEST_LOG.popleft()
+
+                if len(_REQUEST_LOG) < self._rpm_limit:
+                    _REQUEST_LOG.append(now)
+                    return
+
+                sleep_s = 60 - (now - _REQUEST_LOG[0])
+
+            logger.info(f"⏳ RPM-Limit ({self._rpm_limit}/min) - warte {sleep_s:.1f}s")
+            time.sleep(sleep_s)
+
     @retry(
         stop=stop_after_attempt(settings.API_MAX_RETRIES),
         wait=wait_exponential(
@@ -88,7 +404,7 @@ class MassiveClient:
             min=1,
             max=10
         ),
-        retry=retry_if_exception_type((Timeout, ConnectionError)),
+        retry=retry_if_exception_type(_RETRYABLE_ERRORS),
         reraise=True
     )
     def _make_request(
@@ -106,30 +422,51 @@ class MassiveClient:
         Returns:
             dict: API-Response oder None bei Fehler
         """
-        if params is None:
-            params = {}
-        
-        params['apiKey'] = self.api_key
-        
+        # apiKey hängt automatisch an jedem Request (Session-/Client-Params)
+
         try:
-            response = requests.get(
-                url, 
-                params=params, 
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
-        
-        except HTTPError as e:
-            if e.response.status_code == 429:
+            # Iterativer Backoff bei 429 statt fixem 60s-Sleep:
+            # begrenzte Versuche, exponentiell wachsende Wartezeit + Jitter,
+            # Retry-After Header wird respektiert
+            for attempt in range(settings.API_MAX_RETRIES):
+                self._wait_if_throttled()
+                response = self._http_get(url, params)
+
+                status = response.status_code
+                # httpx hat keinen urllib3-Adapter-Retry: 5xx dort in
+                # derselben Backoff-Schleife behandeln (bei requests
+                # erledigt das der HTTPAdapter)
+                retry_5xx = status >= 500 and self._client is not None
+                if status != 429 and not retry_5xx:
+                    break
+
+                retry_after = response.headers.get('Retry-After')
+                if retry_after and retry_after.isdigit():
+                    sleep_s = min(float(retry_after), settings.API_RATE_LIMIT_DELAY)
+                else:
+                    sleep_s = min(
+                        settings.API_RATE_LIMIT_DELAY,
+                        2 ** attempt + random.random()
+                    )
+
                 logger.warning(
-                    f"⚠️ Rate Limit erreicht - warte {settings.API_RATE_LIMIT_DELAY}s"
+                    f"⚠️ HTTP {status} - warte {sleep_s:.1f}s "
+                    f"(Versuch {attempt + 1}/{settings.API_MAX_RETRIES})"
                 )
-                import time
-                time.sleep(settings.API_RATE_LIMIT_DELAY)
-                # Retry automatisch durch @retry decorator
+                time.sleep(sleep_s)
+
+            response.raise_for_status()
+            # orjson parst die rohen Bytes direkt (~3x schneller als der
+            # stdlib-Parser, kein UTF-8-Decode-Zwischenschritt)
+            return orjson.loads(response.content)
+
+        except _HTTP_STATUS_ERRORS as e:
+            if e.response.status_code == 429:
+                # Nur über httpx erreichbar: der requests-HTTPAdapter
+                # retried 429 selbst und wirft danach RetryError
+                logger.error("❌ Rate Limit auch nach Backoff nicht abgeklungen")
                 raise
-            
+
             elif e.response.status_code == 401:
                 logger.error("❌ Ungültiger API-Key!")
                 raise ValueError("Ungültiger API-Key")
@@ -139,18 +476,27 @@ class MassiveClient:
                 return None
             
             else:
+                # 5xx nach ausgeschöpften Retries (HTTPAdapter bei
+                # requests, Backoff-Schleife bei httpx): nicht als
+                # leeres Ergebnis tarnen, sondern den Fehler hochreichen
                 logger.error(f"❌ HTTP Error {e.response.status_code}: {e.response.text[:200]}")
-                return None
-        
-        except Timeout:
+                raise
+
+        except _TIMEOUT_ERRORS:
             logger.error(f"❌ API Timeout nach {self.timeout}s")
             raise  # Retry durch @retry decorator
-        
-        except ConnectionError as e:
+
+        except _RETRYABLE_ERRORS as e:
             logger.error(f"❌ Verbindungsfehler: {e}")
             raise  # Retry durch @retry decorator
-        
-        except RequestException as e:
+
+        except RetryError as e:
+            # requests-Transport: HTTPAdapter-Retries (429/5xx)
+            # ausgeschöpft - hochreichen statt als leeres Ergebnis tarnen
+            logger.error(f"❌ Adapter-Retries ausgeschöpft: {e}")
+            raise
+
+        except _NETWORK_ERRORS as e:
             logger.error(f"❌ Netzwerkfehler: {e}")
             return None
         
@@ -158,98 +504,313 @@ class MassiveClient:
             logger.error(f"❌ Unerwarteter Fehler: {e}", exc_info=True)
             return None
     
+    def _request_aggs(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> tuple:
+        """
+        Holt die rohen Aggregate-Einträge (t/o/h/l/c/v) für einen Zeitraum
+
+        Gemeinsamer Unterbau für get_ohlcv und get_ohlcv_frame - der
+        Redis-Cache sitzt hier, damit beide Pfade (Bar-Liste und
+        DataFrame) dieselben Einträge treffen. Invalidierung nach einer
+        frischen Ingestion über invalidate(symbol).
+
+        Returns:
+            tuple: (results, interval, from_date, to_date)
+        """
+        if interval not in _INTERVAL_MAP:
+            logger.warning(f"⚠️ Unbekanntes Intervall {interval}, verwende 1day")
+            interval = '1day'
+
+        multiplier, timespan = _INTERVAL_MAP[interval]
+
+        # Datum formatieren (ein now() für beide Defaults)
+        now = datetime.now()
+        if not start:
+            start = now.replace(day=1)
+        if not end:
+            end = now
+
+        from_date = _fmt_date(start.date())
+        to_date = _fmt_date(end.date())
+
+        # Cache zuerst: identische Abfrage = kein Netzwerk-Roundtrip
+        cache_key = f"ohlcv:{symbol}:{interval}:{from_date}:{to_date}"
+        cached = self._cache_get(cache_key)
+        if cached:
+            return orjson.loads(cached), interval, from_date, to_date
+
+        url = self._ohlcv_url(symbol, multiplier, timespan, from_date, to_date)
+
+        params = {
+            'adjusted': 'true',
+            'sort': 'asc',
+            'limit': settings.MAX_DATA_POINTS
+        }
+
+        logger.info(f"📊 API Request: {symbol} ({interval}) {from_date} → {to_date}")
+
+        try:
+            data = self._make_request(url, params)
+        except Exception:
+            # API nicht erreichbar: lokaler Parquet-Mirror als
+            # Offline-Fallback (nur der angefragte Zeitraum)
+            results = self._parquet_read(symbol, interval, from_date, to_date)
+            if results is not None:
+                logger.warning(
+                    f"⚠️ API nicht erreichbar - nutze Parquet-Cache für {symbol}"
+                )
+                return results, interval, from_date, to_date
+            raise
+
+        results = data.get('results', []) if data else []
+        if results:
+            self._cache_set(cache_key, orjson.dumps(results))
+            self._parquet_write(symbol, interval, results)
+        return results, interval, from_date, to_date
+
+    def _parquet_write(self, symbol: str, interval: str, results: List[Dict]) -> None:
+        """Spiegelt frische Aggregate in das Parquet-Dataset (best effort)"""
+        if self._parquet_cache is None:
+            return
+        try:
+            self._parquet_cache.write(
+                symbol, interval, [Bar.from_agg(bar) for bar in results]
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Parquet-Cache-Fehler beim Schreiben ({e})")
+
+    def _parquet_read(
+        self,
+        symbol: str,
+        interval: str,
+        from_date: str,
+        to_date: str
+    ) -> Optional[List[Dict]]:
+        """
+        Liest den angefragten Zeitraum aus dem Parquet-Mirror
+
+        Returns:
+            Aggregate-Einträge (t/o/h/l/c/v) oder None bei Cache-Miss
+        """
+        if self._parquet_cache is None:
+            return None
+
+        start_ms = int(datetime.fromisoformat(from_date).timestamp() * 1000)
+        # to_date ist inklusiv (ganzer Tag)
+        end_ms = int((datetime.fromisoformat(to_date).timestamp() + 86400) * 1000)
+
+        try:
+            bars = self._parquet_cache.read(symbol, interval, start_ms, end_ms)
+        except Exception as e:
+            logger.warning(f"⚠️ Parquet-Cache-Fehler beim Lesen ({e})")
+            return None
+
+        if not bars:
+            return None
+
+        return [
+            {'t': b.time, 'o': b.open, 'h': b.high,
+             'l': b.low, 'c': b.close, 'v': b.volume}
+            for b in bars
+        ]
+
     def get_ohlcv(
         self,
         symbol: str,
         interval: str = settings.DEFAULT_INTERVAL,
         start: Optional[datetime] = None,
         end: Optional[datetime] = None
-    ) -> List[Dict]:
+    ) -> List[Bar]:
         """
         Lädt historische OHLCV-Daten (Polygon.io API)
-        
+
         Args:
             symbol: Stock Symbol (z.B. 'AAPL')
             interval: '1min', '5min', '15min', '30min', '1hour', '4hour', '1day', '1week', '1month'
             start: Start-Datum
             end: End-Datum
-        
+
         Returns:
-            List[Dict]: OHLCV-Daten
-        """
-        # Intervall-Mapping
-        interval_map = {
-            '1min': ('1', 'minute'),
-            '5min': ('5', 'minute'),
-            '15min': ('15', 'minute'),
-            '30min': ('30', 'minute'),
-            '1hour': ('1', 'hour'),
-            '4hour': ('4', 'hour'),
-            '1day': ('1', 'day'),
-            '1week': ('1', 'week'),
-            '1month': ('1', 'month')
-        }
-        
-        if interval not in interval_map:
+            List[Bar]: OHLCV-Daten
+        """
+        # Redis-Cache sitzt in _request_aggs (geteilt mit get_ohlcv_frame)
+        results, interval, from_date, to_date = self._request_aggs(
+            symbol, interval, start, end
+        )
+
+        if results:
+            ohlcv_data = [Bar.from_agg(bar) for bar in results]
+
+            logger.info(f"✅ {len(ohlcv_data)} Datenpunkte geladen")
+            return ohlcv_data
+        else:
+            logger.warning(f"⚠️ Keine Daten für {symbol} im Zeitraum {from_date} - {to_date}")
+            return []
+
+    def get_ohlcv_frame(
+        self,
+        symbol: str,
+        interval: str = settings.DEFAULT_INTERVAL,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> "pd.DataFrame":
+        """
+        Lädt historische OHLCV-Daten direkt als DataFrame
+
+        Baut den Frame in einem Rutsch aus der rohen Result-Liste
+        (spaltenweise in C) statt 50k einzelne Python-Records zu
+        allokieren - der schnellste Pfad für Bulk-Inserts und Charts.
+
+        Args:
+            symbol: Stock Symbol (z.B. 'AAPL')
+            interval: Zeitintervall (siehe get_ohlcv)
+            start: Start-Datum
+            end: End-Datum
+
+        Returns:
+            pd.DataFrame: Spalten [time, open, high, low, close, volume]
+        """
+        results, interval, from_date, to_date = self._request_aggs(
+            symbol, interval, start, end
+        )
+
+        if not results:
+            logger.warning(f"⚠️ Keine Daten für {symbol} im Zeitraum {from_date} - {to_date}")
+            return pd.DataFrame()
+
+        df = pd.DataFrame(results).rename(columns={
+            't': 'time',
+            'o': 'open',
+            'h': 'high',
+            'l': 'low',
+            'c': 'close',
+            'v': 'volume'
+        })
+        df['time'] = pd.to_datetime(df['time'], unit='ms')
+        df = df[['time', 'open', 'high', 'low', 'close', 'volume']]
+
+        logger.info(f"✅ {len(df)} Datenpunkte geladen (DataFrame)")
+        return df
+    
+    def iter_ohlcv(
+        self,
+        symbol: str,
+        interval: str = settings.DEFAULT_INTERVAL,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        page_limit: int = 5000
+    ) -> Iterator[Bar]:
+        """
+        Streamt OHLCV-Daten seitenweise statt alles auf einmal zu laden
+
+        Folgt dem next_url-Cursor der API und yieldet Bars Seite für
+        Seite. Peak-Memory bleibt damit O(page_limit) statt O(N) - für
+        sehr große Zeiträume (limit=50000, mehrere MB JSON) wird nie die
+        komplette Antwort materialisiert.
+
+        Args:
+            symbol: Stock Symbol (z.B. 'AAPL')
+            interval: Zeitintervall (siehe get_ohlcv)
+            start: Start-Datum
+            end: End-Datum
+            page_limit: Bars pro Seite
+
+        Yields:
+            Bar: Einzelne OHLCV-Balken
+        """
+        if interval not in _INTERVAL_MAP:
             logger.warning(f"⚠️ Unbekanntes Intervall {interval}, verwende 1day")
             interval = '1day'
-        
-        multiplier, timespan = interval_map[interval]
-        
-        # Datum formatieren
+
+        multiplier, timespan = _INTERVAL_MAP[interval]
+
+        now = datetime.now()
         if not start:
-            start = datetime.now().replace(day=1)
+            start = now.replace(day=1)
         if not end:
-            end = datetime.now()
-        
-        from_date = start.strftime('%Y-%m-%d')
-        to_date = end.strftime('%Y-%m-%d')
-        
-        url = f"{self.base_url}/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{from_date}/{to_date}"
-        
+            end = now
+
+        url = self._ohlcv_url(
+            symbol, multiplier, timespan,
+            _fmt_date(start.date()), _fmt_date(end.date())
+        )
+
         params = {
             'adjusted': 'true',
             'sort': 'asc',
-            'limit': settings.MAX_DATA_POINTS
+            'limit': page_limit
         }
-        
-        logger.info(f"📊 API Request: {symbol} ({interval}) {from_date} → {to_date}")
-        
-        data = self._make_request(url, params)
-        
-        if not data:
-            return []
-        
-        results = data.get('results', [])
-        
-        if results:
-            ohlcv_data = []
+
+        page = 0
+        while url:
+            data = self._make_request(url, params)
+
+            if not data:
+                return
+
+            page += 1
+            results = data.get('results', [])
+            logger.info(f"📄 {symbol}: Seite {page} mit {len(results)} Bars")
+
             for bar in results:
-                ohlcv_data.append({
-                    'time': bar.get('t'),
-                    'open': bar.get('o'),
-                    'high': bar.get('h'),
-                    'low': bar.get('l'),
-                    'close': bar.get('c'),
-                    'volume': bar.get('v')
-                })
-            
-            logger.info(f"✅ {len(ohlcv_data)} Datenpunkte geladen")
-            return ohlcv_data
-        else:
-            logger.warning(f"⚠️ Keine Daten für {symbol} im Zeitraum {from_date} - {to_date}")
-            return []
-    
+                yield Bar.from_agg(bar)
+
+            # next_url trägt alle Query-Parameter bereits im Cursor,
+            # nur der apiKey hängt über die Session-Params erneut an
+            url = data.get('next_url')
+            params = None
+
     def get_historical_data(
         self,
         ticker: str,
         start_date: datetime,
         end_date: datetime,
         interval: str = settings.DEFAULT_INTERVAL
-    ) -> List[Dict]:
+    ) -> List[Bar]:
         """Alias für get_ohlcv() (für Kompatibilität)"""
         return self.get_ohlcv(ticker, interval, start_date, end_date)
     
+    def fetch_batch(
+        self,
+        symbols: List[str],
+        interval: str = settings.DEFAULT_INTERVAL,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        max_concurrency: int = 20
+    ) -> Dict[str, List[Bar]]:
+        """
+        Lädt OHLCV-Daten für viele Symbole parallel (synchroner Wrapper)
+
+        Statt die Symbole seriell abzuarbeiten (50-300ms Netzwerk-Latenz
+        pro Request) fan-out über den AsyncMassiveClient: ein Event-Loop,
+        eine gepoolte Session, Parallelität begrenzt per Semaphore.
+
+        Args:
+            symbols: Liste von Ticker-Symbolen
+            interval: Zeitintervall
+            start: Start-Datum
+            end: End-Datum
+            max_concurrency: Maximale Anzahl gleichzeitiger Requests
+
+        Returns:
+            Dict[str, List[Bar]]: Symbol -> OHLCV-Daten
+        """
+        # Lokaler Import, da async_client selbst aus diesem Modul importiert
+        from apps.data_ingestion.src.async_client import AsyncMassiveClient
+
+        async def _run() -> Dict[str, List[Bar]]:
+            async with AsyncMassiveClient(max_concurrency=max_concurrency) as client:
+                return await client.get_multiple_tickers_data(
+                    symbols, interval, start, end
+                )
+
+        return asyncio.run(_run())
+
     def get_all_tickers(
         self,
         asset_class: str = 'stocks',
@@ -265,8 +826,13 @@ class MassiveClient:
         Returns:
             List[Dict]: Liste aller Ticker
         """
+        cache_key = f"tickers:{asset_class}:{'active' if active else 'inactive'}"
+        cached = self._cache_get(cache_key)
+        if cached:
+            return orjson.loads(cached)
+
         url = f"{self.base_url}/v3/reference/tickers"
-        
+
         params = {
             'type': 'CS',
             'market': asset_class,
@@ -277,42 +843,122 @@ class MassiveClient:
         }
         
         logger.info(f"📥 Lade alle {asset_class} Ticker...")
-        
-        data = self._make_request(url, params)
-        
-        if data:
-            results = data.get('results', [])
+
+        # next_url-Cursor folgen: eine Seite liefert maximal 1000 Ticker,
+        # NASDAQ allein hat ~3500 CS-Ticker
+        results: List[Dict] = []
+        while url:
+            data = self._make_request(url, params)
+
+            if not data:
+                break
+
+            results.extend(data.get('results', []))
+            url = data.get('next_url')
+            params = None
+
+        if results:
+            self._cache_set(cache_key, orjson.dumps(results))
             logger.info(f"✅ {len(results)} Ticker geladen")
             return results
-        
+
         return []
     
+    def get_all_snapshots(self) -> Dict[str, Dict]:
+        """
+        Lädt Snapshots aller US-Stock-Ticker in einem Bulk-Request
+
+        Ein Aufruf des Snapshot-Endpunkts ersetzt N einzelne
+        get_ticker_details-Roundtrips (O(N) Requests -> O(1)).
+
+        Returns:
+            Dict[str, Dict]: Ticker-Symbol -> Snapshot
+        """
+        url = f"{self.base_url}/v2/snapshot/locale/us/markets/stocks/tickers"
+
+        logger.info("📥 Lade Bulk-Snapshot aller Ticker...")
+
+        data = self._make_request(url)
+
+        if not data:
+            return {}
+
+        snapshots = {
+            snapshot['ticker']: snapshot
+            for snapshot in data.get('tickers', [])
+            if 'ticker' in snapshot
+        }
+
+        logger.info(f"✅ {len(snapshots)} Ticker-Snapshots geladen")
+        return snapshots
+
+    def _get_cached_snapshot(self, ticker: str) -> Optional[Dict]:
+        """Holt einen Ticker aus dem Snapshot-Cache (Bulk-Fetch bei Bedarf)"""
+        now = time.time()
+
+        if not self._snapshot_cache or now - self._snapshot_cache_time > self.SNAPSHOT_TTL:
+            snapshots = self.get_all_snapshots()
+            if snapshots:
+                self._snapshot_cache = snapshots
+                self._snapshot_cache_time = now
+
+        return self._snapshot_cache.get(ticker)
+
+    def _fetch_ticker_details(self, ticker: str) -> Dict:
+        """
+        Lädt Ticker-Details (Snapshot-Cache zuerst, dann Einzel-Endpunkt)
+        """
+        snapshot = self._get_cached_snapshot(ticker)
+        if snapshot:
+            return snapshot
+
+        url = self._ticker_details_tpl.format(ticker=ticker)
+
+        data = self._make_request(url)
+
+        if data:
+            return data.get('results', {})
+
+        return {}
+
     def get_ticker_details(self, ticker: str) -> Dict:
         """
         Lädt Details zu einem Ticker
-        
+
+        Pro Instanz memoisiert: der erste Aufruf konsultiert den
+        Bulk-Snapshot-Cache (ein Request für alle Ticker, TTL 5 min)
+        bzw. den Einzel-Endpunkt, jeder weitere ist ein reiner
+        Dict-Lookup. Fehlgeschlagene Lookups (leeres Dict) landen nicht
+        im Cache und werden beim nächsten Aufruf erneut versucht.
+        Invalidierung: invalidate_ticker_details().
+
         Args:
             ticker: Stock Symbol
-        
+
         Returns:
             Dict: Ticker-Details
         """
-        url = f"{self.base_url}/v3/reference/tickers/{ticker}"
-        
-        data = self._make_request(url)
-        
-        if data:
-            return data.get('results', {})
-        
-        return {}
-    
+        cached = self._ticker_details_cache.get(ticker)
+        if cached:
+            return cached
+
+        details = self._fetch_ticker_details(ticker)
+        if details:
+            self._ticker_details_cache[ticker] = details
+        return details
+
+    def invalidate_ticker_details(self) -> None:
+        """Leert den Ticker-Details-Cache (z.B. nach Daten-Refresh)"""
+        self._ticker_details_cache.clear()
+
+
     def get_custom_bars(
         self,
         symbol: str,
         limit: int = 5000,
         timespan: str = 'minute',
         multiplier: int = 1
-    ) -> List[Dict]:
+    ) -> List[Bar]:
         """
         Lädt Custom Aggregate Bars (für initiales Laden von Streaming-Daten)
         
@@ -323,7 +969,7 @@ class MassiveClient:
             multiplier: Multiplikator (z.B. 5 für 5-Minuten-Bars)
         
         Returns:
-            List[Dict]: OHLCV-Daten
+            List[Bar]: OHLCV-Daten
         """
         from datetime import datetime, timedelta
         
@@ -340,10 +986,10 @@ class MassiveClient:
         
         start_date = end_date - timedelta(days=min(days_back, 730))  # Max 2 Jahre
         
-        from_date = start_date.strftime('%Y-%m-%d')
-        to_date = end_date.strftime('%Y-%m-%d')
-        
-        url = f"{self.base_url}/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{from_date}/{to_date}"
+        from_date = _fmt_date(start_date.date())
+        to_date = _fmt_date(end_date.date())
+
+        url = self._ohlcv_url(symbol, multiplier, timespan, from_date, to_date)
         
         params = {
             'adjusted': 'true',
@@ -361,18 +1007,9 @@ class MassiveClient:
         results = data.get('results', [])
         
         if results:
-            ohlcv_data = []
-            for bar in results:
-                ohlcv_data.append({
-                    'time': bar.get('t'),
-                    'open': bar.get('o'),
-                    'high': bar.get('h'),
-                    'low': bar.get('l'),
-                    'close': bar.get('c'),
-                    'volume': bar.get('v')
-                })
-            
+            ohlcv_data = [Bar.from_agg(bar) for bar in results]
+
             logger.info(f"✅ {len(ohlcv_data)} Custom Bars geladen")
             return ohlcv_data
-        
+
         return []
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ohlcv_cache.py - Lokaler OHLCV-Cache als partitioniertes Parquet-Dataset
+"""
+
+import logging
+import os
+from typing import List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ds = None
+    PYARROW_AVAILABLE = False
+
+from apps.data_ingestion.src.massive_client import Bar
+from config import settings
+
+logging.basicConfig(
+    level=settings.LOG_LEVEL,
+    format=settings.LOG_FORMAT
+)
+logger = logging.getLogger(__name__)
+
+
+class OhlcvParquetCache:
+    """
+    Cacht OHLCV-Responses als ein Parquet-Dataset statt vieler JSON-Dateien
+
+    Ein spaltenorientiertes, nach Ticker hive-partitioniertes Dataset pro
+    Intervall: Bulk-Reload öffnet wenige große Dateien statt tausender
+    kleiner JSONs (weniger Inodes, weniger Dekompressions-CPU), und Reads
+    filtern per Partition-Pruning direkt auf den gewünschten Ticker.
+
+    Verwendung:
+        cache = OhlcvParquetCache()
+        cache.write('AAPL', '1day', bars)
+        bars = cache.read('AAPL', '1day')
+    """
+
+    def __init__(self, cache_dir: str = 'data/ohlcv_cache'):
+        """
+        Initialisiert den Parquet-Cache
+
+        Args:
+            cache_dir: Wurzelverzeichnis des Datasets
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError(
+                "pyarrow nicht installiert - für den Parquet-Cache bitte "
+                "'conda install -c conda-forge pyarrow' ausführen"
+            )
+
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+        logger.info(f"✅ OhlcvParquetCache initialisiert ({cache_dir})")
+
+    def _interval_dir(self, interval: str) -> str:
+        return os.path.join(self.cache_dir, interval)
+
+    def write(self, symbol: str, interval: str, bars: List[Bar]) -> None:
+        """
+        Schreibt Bars eines Symbols in das Dataset
+
+        Die Bars werden spaltenweise (SoA) in eine pyarrow.Table gepackt
+        und in die Hive-Partition ticker=<symbol> geschrieben.
+
+        Args:
+            symbol: Ticker-Symbol
+            interval: Zeitintervall (z.B. '1day')
+            bars: OHLCV-Daten
+        """
+        if not bars:
+            return
+
+        table = pa.table({
+            'time': pa.array([b.time for b in bars], pa.int64()),
+            'open': pa.array([b.open for b in bars], pa.float64()),
+            'high': pa.array([b.high for b in bars], pa.float64()),
+            'low': pa.array([b.low for b in bars], pa.float64()),
+            'close': pa.array([b.close for b in bars], pa.float64()),
+            'volume': pa.array([b.volume for b in bars], pa.float64()),
+            'ticker': pa.array([symbol] * len(bars), pa.string())
+        })
+
+        ds.write_dataset(
+            table,
+            self._interval_dir(interval),
+            format='parquet',
+            partitioning=ds.partitioning(
+                pa.schema([('ticker', pa.string())]),
+                flavor='hive'
+            ),
+            existing_data_behavior='delete_matching'
+        )
+
+        logger.info(f"💾 {len(bars)} Bars für {symbol} ({interval}) gecacht")
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> Optional[List[Bar]]:
+        """
+        Liest die gecachten Bars eines Symbols
+
+        Partition-Pruning auf den Ticker plus optionaler Zeitfilter
+        direkt im Scan - es werden nur die angefragten Row-Groups
+        dekomprimiert.
+
+        Args:
+            symbol: Ticker-Symbol
+            interval: Zeitintervall
+            start_ms: Untere Zeitgrenze (Unix-Millisekunden, inklusiv)
+            end_ms: Obere Zeitgrenze (Unix-Millisekunden, exklusiv)
+
+        Returns:
+            List[Bar] oder None, wenn nichts gecacht ist
+        """
+        interval_dir = self._interval_dir(interval)
+
+        if not os.path.isdir(interval_dir):
+            return None
+
+        dataset = ds.dataset(
+            interval_dir,
+            format='parquet',
+            partitioning='hive'
+        )
+
+        predicate = ds.field('ticker') == symbol
+        if start_ms is not None:
+            predicate = predicate & (ds.field('time') >= start_ms)
+        if end_ms is not None:
+            predicate = predicate & (ds.field('time') < end_ms)
+
+        table = dataset.to_table(filter=predicate)
+
+        if table.num_rows == 0:
+            return None
+
+        columns = [
+            table.column(name).to_pylist()
+            for name in ('time', 'open', 'high', 'low', 'close', 'volume')
+        ]
+        bars = [Bar(*values) for values in zip(*columns)]
+
+        logger.info(f"📦 {len(bars)} Bars für {symbol} ({interval}) aus Cache geladen")
+        return bars
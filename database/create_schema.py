@@ -10,6 +10,7 @@ Created on Thu Jan 15 09:52:06 2026
 """
 Erstellt das Datenbank-Schema automatisch
 """
+import itertools
 import sys
 import os
 
@@ -37,26 +38,39 @@ def create_schema():
     # SQL-Datei lesen
     with open(sql_file, 'r') as f:
         sql_content = f.read()
-    
-    # SQL ausführen (aufteilen bei Semikolon für einzelne Statements)
-    statements = [s.strip() for s in sql_content.split(';') if s.strip()]
-    
+
+    # Statements bleiben für die Fallback-Schleife vorbereitet
+    statements = [
+        s.strip() for s in sql_content.split(';')
+        if s.strip() and not s.strip().startswith('--')
+    ]
+
+    # Erst als ein Multi-Statement-Block: psycopg2 schickt die komplette
+    # Datei in einem Roundtrip statt N einzelner execute()-Aufrufe
+    try:
+        with engine.begin() as connection:
+            print(f"\n📦 Führe {len(statements)} Statements in einem Block aus...")
+            connection.exec_driver_sql(sql_content)
+
+        print("\n" + "="*60)
+        print("✅ Schema-Erstellung abgeschlossen!")
+        print("="*60)
+        return True
+
+    except Exception as e:
+        print(f"⚠️  Bulk-Ausführung fehlgeschlagen ({e})")
+        print("   Wechsle auf Einzel-Statements zur Fehler-Lokalisierung...")
+
+    # Fallback: Statement für Statement, damit der Fehler zuordenbar ist
     try:
         with engine.begin() as connection:
             for i, statement in enumerate(statements, 1):
-                if not statement:
-                    continue
-                    
-                # Kommentare entfernen
-                if statement.startswith('--'):
-                    continue
-                
                 print(f"\n[{i}/{len(statements)}] Führe Statement aus...")
-                
+
                 # Erste 60 Zeichen des Statements anzeigen
                 preview = statement[:60].replace('\n', ' ')
                 print(f"   {preview}...")
-                
+
                 try:
                     connection.execute(text(statement))
                     print(f"   ✅ Erfolgreich")
@@ -67,12 +81,12 @@ def create_schema():
                     else:
                         print(f"   ❌ Fehler: {e}")
                         # Weiter mit nächstem Statement
-        
+
         print("\n" + "="*60)
         print("✅ Schema-Erstellung abgeschlossen!")
         print("="*60)
         return True
-        
+
     except Exception as e:
         print(f"\n❌ Fehler beim Erstellen des Schemas: {e}")
         return False
@@ -89,30 +103,30 @@ def verify_schema():
         'stock_ohlcv',
         'stock_metadata'
     ]
-    
+
     with engine.connect() as connection:
+        # Alle Tabellen + Spalten in einem Roundtrip statt 2 Queries
+        # pro Tabelle; Existenz folgt aus nicht-leerer Gruppe
+        result = connection.execute(text("""
+            SELECT table_name, column_name, data_type
+            FROM information_schema.columns
+            WHERE table_name = ANY(:tables)
+            ORDER BY table_name, ordinal_position;
+        """), {'tables': expected_tables})
+
+        columns_by_table = {
+            table: [row[1] for row in rows]
+            for table, rows in itertools.groupby(result.fetchall(), key=lambda r: r[0])
+        }
+
         for table in expected_tables:
-            result = connection.execute(text(f"""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = '{table}'
-                );
-            """))
-            exists = result.scalar()
-            
-            status = "✅" if exists else "❌"
+            columns = columns_by_table.get(table)
+
+            status = "✅" if columns else "❌"
             print(f"{status} {table}")
-            
-            if exists:
-                # Spalten anzeigen
-                result = connection.execute(text(f"""
-                    SELECT column_name, data_type 
-                    FROM information_schema.columns 
-                    WHERE table_name = '{table}'
-                    ORDER BY ordinal_position;
-                """))
-                columns = result.fetchall()
-                print(f"   Spalten: {', '.join([c[0] for c in columns])}")
+
+            if columns:
+                print(f"   Spalten: {', '.join(columns)}")
 
 def main():
     """Hauptfunktion"""
@@ -15,6 +15,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 from apps.data_ingestion.src.database import engine
+from database.schema_utils import table_columns
 from sqlalchemy import text
 
 def fix_stock_ohlcv():
@@ -69,14 +70,9 @@ def fix_stock_ohlcv():
         
         # 5. Verifizieren
         print("\n5. Verifiziere Spalten...")
-        result = conn.execute(text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'stock_ohlcv'
-            ORDER BY ordinal_position;
-        """))
-        
-        columns = [row[0] for row in result]
+        # Prepared Statement (einmal PREPARE pro Verbindung, dann nur
+        # EXECUTE): Server spart Parse+Plan, Tabellenname bleibt Parameter
+        columns = [row[0] for row in table_columns(conn, 'stock_ohlcv')]
         print(f"   Spalten: {', '.join(columns)}")
         
         # Prüfen ob 'open' und 'close' vorhanden sind
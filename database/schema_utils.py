@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+schema_utils.py - Gemeinsame Helfer für die Schema-Scripts
+"""
+
+# PREPARE einmal pro Verbindung, danach nur noch EXECUTE: der Server
+# spart sich Parse+Plan pro Aufruf (auf System-Katalogen nicht trivial)
+_PREPARE_TS_COLS = """
+    PREPARE ts_cols(text) AS
+    SELECT column_name, data_type
+    FROM information_schema.columns
+    WHERE table_name = $1
+    ORDER BY ordinal_position
+"""
+
+_TS_COLS_SELECT = """
+    SELECT column_name, data_type
+    FROM information_schema.columns
+    WHERE table_name = %s
+    ORDER BY ordinal_position
+"""
+
+
+def table_columns(connection, table):
+    """
+    Liefert (column_name, data_type) einer Tabelle über ein Prepared Statement
+
+    Mit psycopg2 wird beim ersten Aufruf pro Verbindung das Statement
+    mit PREPARE angelegt; Folgeaufrufe (z.B. mehrere Tabellen
+    nacheinander) führen nur noch EXECUTE aus. Der Prepared-Status
+    hängt an der DBAPI-Verbindung (connection.info), nicht am
+    SQLAlchemy-Wrapper. Mit psycopg3 läuft ein einfaches
+    parameterisiertes SELECT: der Treiber bindet serverseitig
+    (EXECUTE als Utility-Statement akzeptiert keine $1-Platzhalter)
+    und prepared wiederholte Queries von selbst.
+
+    Args:
+        connection: SQLAlchemy-Connection
+        table: Tabellenname
+
+    Returns:
+        list: Zeilen (column_name, data_type) in Spaltenreihenfolge
+    """
+    if connection.dialect.driver != 'psycopg2':
+        return connection.exec_driver_sql(_TS_COLS_SELECT, (table,)).fetchall()
+
+    if not connection.info.get('ts_cols_prepared'):
+        connection.exec_driver_sql(_PREPARE_TS_COLS)
+        connection.info['ts_cols_prepared'] = True
+
+    return connection.exec_driver_sql("EXECUTE ts_cols(%s)", (table,)).fetchall()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+_dashboard_runner.py - Gemeinsamer Launcher für die Dashboard-Tests
+
+Ein parametrisiertes run() statt dreifach kopierter Start-Logik:
+panel wird nur einmal pro Prozess importiert und compare_dashboards
+kann beide Varianten in-process (multiprocessing) starten, ohne den
+Interpreter- und Panel-Import doppelt zu bezahlen.
+"""
+import importlib
+import sys
+import os
+import traceback
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from test.utils import find_free_port
+
+
+def _check_database():
+    """Prüft DB-Verbindung und Datenverfügbarkeit (nur Warnungen)"""
+    try:
+        from apps.data_ingestion.src.database import engine, test_connection
+        from sqlalchemy import text
+
+        if not test_connection():
+            print("⚠️  Datenbank nicht erreichbar - Dashboard könnte leer sein")
+            return
+
+        with engine.connect() as conn:
+            result = conn.execute(text("SELECT COUNT(*) FROM stock_ohlcv"))
+            count = result.scalar()
+
+        if count > 0:
+            print(f"   ✅ {count} Datensätze in der Datenbank")
+        else:
+            print("⚠️  Keine Daten vorhanden - Dashboard wird leer sein")
+            print("   💡 Führe zuerst test_ingestion.py aus, um Daten zu laden")
+
+    except Exception as e:
+        print(f"⚠️  DB-Check übersprungen: {e}")
+
+
+def run(app_module: str, backend: str):
+    """
+    Startet ein Dashboard mit automatischer Port-Auswahl
+
+    Args:
+        app_module: Modul-Pfad mit einem `dashboard`-Objekt
+                    (z.B. 'apps.dashboard.src.app')
+        backend: Panel-Extension ('plotly' oder 'bokeh')
+    """
+    import panel as pn
+
+    pn.extension(backend)
+
+    print("="*60)
+    print(f"🎨 Dashboard Test ({backend})")
+    print("="*60)
+
+    # Dashboard importieren
+    try:
+        dashboard = importlib.import_module(app_module).dashboard
+        print("✅ Dashboard erfolgreich importiert")
+    except Exception as e:
+        print(f"❌ Import-Fehler: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+    _check_database()
+
+    # Freien Port finden und Server starten
+    try:
+        port = find_free_port()
+        print(f"\n🚀 Starte Dashboard auf Port {port}...")
+        print(f"   URL: http://localhost:{port}")
+        print("   Drücke Ctrl+C zum Beenden\n")
+
+        dashboard.show().show(port=port, threaded=False)
+    except KeyboardInterrupt:
+        print("\n\n👋 Dashboard beendet")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n❌ Fehler beim Starten: {e}")
+        traceback.print_exc()
+        print("\n💡 Versuche:")
+        print("   1. Alle Python-Prozesse beenden: pkill python")
+        print("   2. Script erneut ausführen")
+        sys.exit(1)
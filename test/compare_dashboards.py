@@ -10,45 +10,52 @@ Created on Thu Jan 15 18:57:40 2026
 """
 Vergleicht Plotly und Bokeh Dashboard-Performance
 """
-import subprocess
+import multiprocessing
 import sys
+import os
 
-print("="*60)
-print("📊 Dashboard Vergleich")
-print("="*60)
-print("\n1 - Plotly Dashboard (Port 5006)")
-print("2 - Bokeh Dashboard (Port 5007)")
-print("3 - Beide parallel starten")
-print("0 - Beenden")
-
-choice = input("\nDeine Wahl (0-3): ").strip()
-
-if choice == '1':
-    print("\n🚀 Starte Plotly Dashboard...")
-    subprocess.run([sys.executable, "test/test_dashboard.py"])
-elif choice == '2':
-    print("\n🚀 Starte Bokeh Dashboard...")
-    subprocess.run([sys.executable, "test/test_dashboard_bokeh.py"])
-elif choice == '3':
-    print("\n🚀 Starte beide Dashboards...")
-    print("   Plotly: http://localhost:5006")
-    print("   Bokeh:  http://localhost:5007")
-    # Beide parallel starten (nur Linux/Mac)
-    import threading
-    
-    def start_plotly():
-        subprocess.run([sys.executable, "test_dashboard.py"])
-    
-    def start_bokeh():
-        subprocess.run([sys.executable, "test_dashboard_bokeh.py"])
-    
-    t1 = threading.Thread(target=start_plotly)
-    t2 = threading.Thread(target=start_bokeh)
-    
-    t1.start()
-    t2.start()
-    
-    t1.join()
-    t2.join()
-else:
-    print("👋 Tschüss!")
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from test._dashboard_runner import run
+
+
+def main():
+    print("="*60)
+    print("📊 Dashboard Vergleich")
+    print("="*60)
+    print("\n1 - Plotly Dashboard")
+    print("2 - Bokeh Dashboard")
+    print("3 - Beide parallel starten")
+    print("0 - Beenden")
+
+    choice = input("\nDeine Wahl (0-3): ").strip()
+
+    if choice == '1':
+        print("\n🚀 Starte Plotly Dashboard...")
+        run('apps.dashboard.src.app', 'plotly')
+    elif choice == '2':
+        print("\n🚀 Starte Bokeh Dashboard...")
+        run('apps.dashboard.src.app_bokeh', 'bokeh')
+    elif choice == '3':
+        print("\n🚀 Starte beide Dashboards...")
+        # In-process statt subprocess: spart den doppelten
+        # Interpreter-Start, panel wird pro Prozess nur einmal geladen
+        p1 = multiprocessing.Process(
+            target=run, args=('apps.dashboard.src.app', 'plotly')
+        )
+        p2 = multiprocessing.Process(
+            target=run, args=('apps.dashboard.src.app_bokeh', 'bokeh')
+        )
+
+        p1.start()
+        p2.start()
+
+        p1.join()
+        p2.join()
+    else:
+        print("👋 Tschüss!")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,36 +12,117 @@ Test-Script für Stock Data Ingestion mit Massive.com API
 #from database import test_connection
 #from massive_client import MassiveClient
 #from ingestion import StockDataIngestion
-from apps.data_ingestion.src.database import test_connection, get_db_session, engine
+from apps.data_ingestion.src.database import test_connection, engine
 from apps.data_ingestion.src.massive_client import MassiveClient
 from apps.data_ingestion.src.ingestion import StockDataIngestion
 
-from datetime import datetime, timedelta
-from dotenv import load_dotenv
-import os
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from sqlalchemy import text
 
-load_dotenv()
+from config import settings
+
+# Verify-Statements einmal pro Prozess bauen; der geteilte compiled_cache
+# hält die kompilierte Form über wiederholte Menü-Aufrufe (Wahl "5")
+_VERIFY_CACHE = {}
+
+# Referenzzeitpunkt einmal pro Testlauf - timezone-aware, damit der
+# Server keine naive Timestamps casten muss
+NOW_UTC = datetime.now(timezone.utc)
+
+_VERIFY_TOTALS_STMT = text("""
+    SELECT
+        approximate_row_count('stock_ohlcv') AS ohlcv_rows,
+        approximate_row_count('stock_quotes') AS quotes_rows
+""").execution_options(compiled_cache=_VERIFY_CACHE)
+
+_VERIFY_DETAIL_TS = """
+    WITH o AS (
+        SELECT
+            'ohlcv' AS src,
+            symbol,
+            interval,
+            COUNT(*) AS count,
+            first(time, time) AS first_date,
+            last(time, time) AS last_date
+        FROM stock_ohlcv
+        GROUP BY symbol, interval
+    ), q AS (
+        SELECT
+            'quotes' AS src,
+            symbol,
+            NULL AS interval,
+            COUNT(*) AS count,
+            first(time, time) AS first_date,
+            last(time, time) AS last_date
+        FROM stock_quotes
+        GROUP BY symbol
+    )
+    SELECT * FROM o
+    UNION ALL
+    SELECT * FROM q
+    ORDER BY src, symbol, interval
+"""
+
+_VERIFY_DETAIL_TS_STMT = text(_VERIFY_DETAIL_TS).execution_options(
+    compiled_cache=_VERIFY_CACHE
+)
+
+# Fallback für Vanilla-Postgres (kein first()/last())
+_VERIFY_DETAIL_FALLBACK_STMT = text(
+    _VERIFY_DETAIL_TS
+    .replace('first(time, time)', 'MIN(time)')
+    .replace('last(time, time)', 'MAX(time)')
+).execution_options(compiled_cache=_VERIFY_CACHE)
+
+
+_MENU = (
+    "\n" + "="*60 + "\n"
+    "Welchen Test möchtest du ausführen?\n"
+    + "="*60 + "\n"
+    "1 - Einzelnes Symbol (AAPL, 30 Tage, täglich)\n"
+    "2 - Mehrere Symbole ('AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA', 'META'...  1 Jahr)\n"
+    "3 - Intraday-Daten (AAPL, 7 Tage, 5-Minuten)\n"
+    "4 - Alle Tests ausführen\n"
+    "5 - Daten verifizieren\n"
+    "0 - Beenden\n"
+)
+
+
+def _banner(title: str):
+    """Gibt einen Abschnitts-Banner mit einem einzigen write() aus"""
+    sys.stdout.write(f"\n{'='*60}\n{title}\n{'='*60}\n")
+    sys.stdout.flush()
+
+
+@lru_cache(maxsize=1)
+def get_client() -> MassiveClient:
+    """Ein MassiveClient pro Testlauf (Session/Auth nur einmal aufbauen)"""
+    return MassiveClient()
+
+
+@lru_cache(maxsize=1)
+def get_ingestion() -> StockDataIngestion:
+    """Eine StockDataIngestion pro Testlauf (geteilter Client + Engine-Pool)"""
+    return StockDataIngestion()
 
 
 def test_api_connection():
     """Testet die Massive.com API-Verbindung"""
-    print("\n" + "="*60)
-    print("🔌 Teste Massive.com API-Verbindung")
-    print("="*60)
+    _banner("🔌 Teste Massive.com API-Verbindung")
     
-    client = MassiveClient()
-    return client.test_connection()
+    return get_client().test_connection()
 
 def test_single_symbol():
     """Testet das Laden eines einzelnen Symbols"""
-    print("\n" + "="*60)
-    print("📊 Test: Einzelnes Symbol (AAPL)")
-    print("="*60)
+    _banner("📊 Test: Einzelnes Symbol (AAPL)")
     
-    ingestion = StockDataIngestion()
+    ingestion = get_ingestion()
     
     # Letzten 30 Tage laden
-    end_date = datetime.now()
+    end_date = NOW_UTC
     start_date = end_date - timedelta(days=30)
     
     ingestion.ingest_symbol(
@@ -51,35 +132,36 @@ def test_single_symbol():
         interval='1day'
     )
 
-def test_multiple_symbols():
-    """Testet das Laden mehrerer Symbole"""
-    print("\n" + "="*60)
-    print("📊 Test: Mehrere Symbole")
-    print("="*60)
-    
-    ingestion = StockDataIngestion()
-    
+async def test_multiple_symbols_async():
+    """Testet das Laden mehrerer Symbole (async)"""
+    _banner("📊 Test: Mehrere Symbole")
+
+    ingestion = get_ingestion()
+
     symbols = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA', 'META', 'NFLX', 'FLNC', 'TTD', 'HIMS']
-    end_date = datetime.now()
+    end_date = NOW_UTC
     start_date = end_date - timedelta(days=720)  # 3 Monate
-    
-    ingestion.ingest_multiple_symbols(
+
+    # Parallel statt sequentiell: alle Symbole gleichzeitig anfragen
+    await ingestion.ingest_multiple_symbols_async(
         symbols=symbols,
         start_date=start_date,
         end_date=end_date,
         interval='1day'
     )
 
+def test_multiple_symbols():
+    """Testet das Laden mehrerer Symbole"""
+    asyncio.run(test_multiple_symbols_async())
+
 def test_intraday_data():
     """Testet das Laden von Intraday-Daten (Minutengenaue Daten)"""
-    print("\n" + "="*60)
-    print("📊 Test: Intraday-Daten (5-Minuten)")
-    print("="*60)
+    _banner("📊 Test: Intraday-Daten (5-Minuten)")
     
-    ingestion = StockDataIngestion()
+    ingestion = get_ingestion()
     
     # Letzten 5 Handelstage
-    end_date = datetime.now()
+    end_date = NOW_UTC
     start_date = end_date - timedelta(days=7)
     
     ingestion.ingest_symbol(
@@ -90,98 +172,108 @@ def test_intraday_data():
         save_as_quotes=True  # Auch in stock_quotes speichern
     )
 
+async def run_all_tests():
+    """
+    Führt alle drei Tests gleichzeitig aus (Menü-Wahl "4")
+
+    Die Tests teilen keinen veränderlichen Zustand und hängen alle an
+    derselben API - nebenläufig dauert die Gesamtausführung nur so
+    lange wie der langsamste Test statt der Summe. Die beiden Tests mit
+    synchronem Client laufen per to_thread in Worker-Threads, der
+    Multi-Symbol-Test nativ im Event-Loop; das API-Rate-Limit greift in
+    beiden Clients.
+    """
+    await asyncio.gather(
+        asyncio.to_thread(test_single_symbol),
+        test_multiple_symbols_async(),
+        asyncio.to_thread(test_intraday_data),
+    )
+
 def verify_data():
     """Verifiziert die gespeicherten Daten"""
-    print("\n" + "="*60)
-    print("🔍 Verifiziere gespeicherte Daten")
-    print("="*60)
-    
-    from sqlalchemy import text
-    from database import engine
+    _banner("🔍 Verifiziere gespeicherte Daten")
     
-    with engine.connect() as conn:
-        # Anzahl Datensätze in stock_ohlcv
-        result = conn.execute(text("""
-            SELECT 
-                symbol,
-                interval,
-                COUNT(*) as count,
-                MIN(time) as first_date,
-                MAX(time) as last_date
-            FROM stock_ohlcv
-            GROUP BY symbol, interval
-            ORDER BY symbol, interval
-        """))
-        
-        print("\n📊 Stock OHLCV Daten:")
-        for row in result:
-            print(f"   {row.symbol:8s} | {row.interval:6s} | "
-                  f"{row.count:5d} Datensätze | "
-                  f"{row.first_date.date()} bis {row.last_date.date()}")
-        
-        # Anzahl Datensätze in stock_quotes
-        result = conn.execute(text("""
-            SELECT 
-                symbol,
-                COUNT(*) as count,
-                MIN(time) as first_date,
-                MAX(time) as last_date
-            FROM stock_quotes
-            GROUP BY symbol
-            ORDER BY symbol
-        """))
-        
-        print("\n📊 Stock Quotes Daten:")
-        rows = list(result)
-        if rows:
-            for row in rows:
-                print(f"   {row.symbol:8s} | "
-                      f"{row.count:6d} Datensätze | "
-                      f"{row.first_date.date()} bis {row.last_date.date()}")
-        else:
-            print("   Keine Daten vorhanden")
+    # Schneller Gesamtüberblick aus den Chunk-Metadaten (O(#Chunks)
+    # statt Full-Scan) - nur mit TimescaleDB verfügbar
+    try:
+        with engine.connect() as conn:
+            totals = conn.execute(_VERIFY_TOTALS_STMT).fetchone()
+        print(f"\n📊 Gesamt (approximiert): "
+              f"stock_ohlcv ≈ {totals.ohlcv_rows}, "
+              f"stock_quotes ≈ {totals.quotes_rows}")
+    except Exception:
+        pass  # Kein TimescaleDB - Überblick überspringen
+
+    # Beide Aggregationen in einem Roundtrip (CTE + UNION ALL).
+    # first()/last() sind TimescaleDB-Aggregate, die die Chunk-Ordnung
+    # ausnutzen; auf Vanilla-Postgres greift der MIN/MAX-Fallback.
+    # mappings() liefert Dicts statt Row-Objekten - spart den
+    # __getattr__-Descriptor-Lookup pro Spalte und Zeile
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(_VERIFY_DETAIL_TS_STMT).mappings().all()
+    except Exception:
+        with engine.connect() as conn:
+            rows = conn.execute(_VERIFY_DETAIL_FALLBACK_STMT).mappings().all()
+
+    ohlcv_rows = []
+    quotes_rows = []
+    for row in rows:
+        (ohlcv_rows if row['src'] == 'ohlcv' else quotes_rows).append(row)
+
+    # Ausgabe einmal zusammensetzen und mit einem write() schreiben
+    # statt ein print() (Lock + Flush) pro Zeile
+    lines = ["\n📊 Stock OHLCV Daten:"]
+    lines.extend(
+        f"   {r['symbol']:8s} | {r['interval']:6s} | "
+        f"{r['count']:5d} Datensätze | "
+        f"{r['first_date'].date()} bis {r['last_date'].date()}"
+        for r in ohlcv_rows
+    )
+    lines.append("\n📊 Stock Quotes Daten:")
+    if quotes_rows:
+        lines.extend(
+            f"   {r['symbol']:8s} | "
+            f"{r['count']:6d} Datensätze | "
+            f"{r['first_date'].date()} bis {r['last_date'].date()}"
+            for r in quotes_rows
+        )
+    else:
+        lines.append("   Keine Daten vorhanden")
+
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
 def main():
     """Hauptfunktion"""
-    print("\n" + "="*60)
-    print("🚀 Stock Data Ingestion - Test Suite")
-    print("="*60)
+    _banner("🚀 Stock Data Ingestion - Test Suite")
     
-    # API Key prüfen
-    api_key = os.getenv('MASSIVE_API_KEY')
-    if not api_key:
+    # API Key prüfen (einmal geparst und gecacht in config.settings,
+    # kein erneuter dotenv-/Umgebungs-Lookup pro Testlauf)
+    if not settings.MASSIVE_API_KEY:
         print("\n⚠️  WARNUNG: MASSIVE_API_KEY nicht gesetzt!")
         print("   Setze in .env: MASSIVE_API_KEY=your_key_here")
         print("   Die Tests werden trotzdem ausgeführt, könnten aber fehlschlagen.\n")
     
     # 1. Datenbankverbindung testen
-    print("\n" + "="*60)
-    print("1️⃣  Teste Datenbankverbindung")
-    print("="*60)
+    _banner("1️⃣  Teste Datenbankverbindung")
     if not test_connection():
         print("\n❌ Abbruch: Keine Datenbankverbindung")
         return
     
     # 2. API-Verbindung testen
-    print("\n" + "="*60)
-    print("2️⃣  Teste API-Verbindung")
-    print("="*60)
+    _banner("2️⃣  Teste API-Verbindung")
     if not test_api_connection():
         print("\n❌ Abbruch: Keine API-Verbindung")
         return
     
     # 3. Tests ausführen (Auswahl)
     while True:
-        print("\n" + "="*60)
-        print("Welchen Test möchtest du ausführen?")
-        print("="*60)
-        print("1 - Einzelnes Symbol (AAPL, 30 Tage, täglich)")
-        print("2 - Mehrere Symbole ('AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA', 'META'...  1 Jahr)")
-        print("3 - Intraday-Daten (AAPL, 7 Tage, 5-Minuten)")
-        print("4 - Alle Tests ausführen")
-        print("5 - Daten verifizieren")
-        print("0 - Beenden")
-        
+        # Menü als ein write() statt ~10 print()-Aufrufe (ein Syscall,
+        # ein Flush pro Redraw)
+        sys.stdout.write(_MENU)
+        sys.stdout.flush()
+
         choice = input("\nDeine Wahl (0-5): ").strip()
         
         if choice == '1':
@@ -191,9 +283,8 @@ def main():
         elif choice == '3':
             test_intraday_data()
         elif choice == '4':
-            test_single_symbol()
-            test_multiple_symbols()
-            test_intraday_data()
+            # Alle Tests nebenläufig: Wallclock = max(t1, t2, t3)
+            asyncio.run(run_all_tests())
         elif choice == '5':
             verify_data()
         elif choice == '0':
@@ -201,9 +292,7 @@ def main():
         else:
             print("❌ Ungültige Eingabe")
     
-    print("\n" + "="*60)
-    print("✅ Tests abgeschlossen!")
-    print("="*60)
+    _banner("✅ Tests abgeschlossen!")
     print("\n💡 Nächste Schritte:")
     print("   - Daten in pgAdmin prüfen: http://localhost:5050")
     print("   - SQL-Queries in database/schemas/ anschauen")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+utils.py - Gemeinsame Helfer für die Test-Scripts
+"""
+import socket
+
+
+def find_free_port(start_port=None, max_attempts=10):
+    """
+    Findet einen freien Port
+
+    Ohne start_port wählt der Kernel selbst einen freien Port
+    (bind auf Port 0): ein Syscall, kein Raten, keine Races.
+    Mit start_port wird der Bereich wie bisher abgescannt, falls
+    ein Aufrufer einen bestimmten Port-Bereich braucht.
+
+    Args:
+        start_port: Erster Port des Scan-Bereichs (None = Kernel wählt)
+        max_attempts: Größe des Scan-Bereichs bei gesetztem start_port
+
+    Returns:
+        int: Freier Port
+    """
+    if start_port is None:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(('localhost', 0))
+            return sock.getsockname()[1]
+
+    # Fallback: expliziter Bereich (z.B. feste Dashboard-Ports)
+    for port in range(start_port, start_port + max_attempts):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind(('localhost', port))
+                return port
+            except OSError:
+                continue
+    raise RuntimeError(
+        f"Kein freier Port zwischen {start_port} und "
+        f"{start_port + max_attempts} gefunden"
+    )